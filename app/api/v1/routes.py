@@ -1,123 +1,87 @@
 import asyncio
-import json
+import logging
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from itertools import chain
 from typing import Any
+import orjson
 from fastapi import APIRouter
 from fastapi import Body
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
 from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
+from app.config import settings
+from app.graphs.shopping_graph import UNCACHEABLE_CONFIDENCE
 from app.graphs.shopping_graph import run_shopping_graph
 from app.graphs.shopping_graph import run_shopping_graph_stream
 from app.models.payload import BulkDocumentPayload
+from app.models.payload import DocumentPayload
 from app.models.payload import QueryPayload
 from app.models.response import Response
 from app.services.rag_service import add_documents as rag_add_documents
 from app.services.session_service import session_service
+from app.utils.cache import AsyncTTLCache
 from app.utils.errors import Error
 from app.utils.errors import ErrorCode
+from app.utils.input_sanitization import SanitizationResult
 from app.utils.input_sanitization import sanitize_document_content
 from app.utils.input_sanitization import sanitize_llm_query
 from app.utils.input_sanitization import validate_document_metadata
 from app.utils.logger import get_logger
-from app.utils.logger import setup_logging
 
-setup_logging()
 logger = get_logger("api.shopping")
 
 router = APIRouter()
 
 
-@router.post(
-    "/query",
-    response_model=Response,
-    summary="Query the shopping assistant",
-    description="Submit a shopping-related question and get an AI-powered answer",
-    responses={
-        200: {
-            "description": "Successful query response",
-            "content": {
-                "application/json": {
-                    "example": {
-                        "status": "success",
-                        "data": "Our latest smartphones feature advanced AI cameras, 5G connectivity, and all-day battery life. The flagship model includes a 108MP camera system, 12GB RAM, and 256GB storage.",
-                        "message": "Query processed successfully",
-                        "timestamp": "2024-01-15T10:30:00Z",
-                    }
-                }
-            },
-        },
-        400: {
-            "description": "Invalid input or query too long",
-            "content": {
-                "application/json": {
-                    "example": {
-                        "error": {
-                            "code": "invalid_input",
-                            "message": "Query contains potentially harmful content",
-                        }
-                    }
-                }
-            },
-        },
-        413: {"description": "Request too large"},
-        429: {"description": "Rate limit exceeded"},
-    },
-)
-async def query_shopping(
-    payload: QueryPayload = Body(
-        ...,
-        examples={
-            "product_inquiry": {
-                "summary": "Product feature inquiry",
-                "description": "Ask about specific product features",
-                "value": {"q": "What are the features of your latest smartphone?"},
-            },
-            "general_question": {
-                "summary": "General shopping question",
-                "description": "General shopping-related inquiry",
-                "value": {"q": "Do you offer free shipping?"},
-            },
-            "comparison": {
-                "summary": "Product comparison",
-                "description": "Compare different products",
-                "value": {"q": "What's the difference between your Pro and Standard models?"},
-            },
-        },
-    )
-):
-    """Submit a shopping question and get an AI-powered answer.
+@lru_cache(maxsize=4096)
+def _sanitize_cached(q: str, strict: bool) -> SanitizationResult:
+    """Memoized `sanitize_llm_query` so repeated questions skip the regex pipeline.
 
-    This endpoint processes natural language questions about products, services, or shopping-related
-    inquiries using our RAG (Retrieval-Augmented Generation) system.
+    Callers must treat the returned result as read-only since it is shared between requests.
     """
-    q = payload.q
-    if not q:
-        raise Error(
-            ErrorCode.INVALID_INPUT,
-            details={"field": "q"},
-            message="Request body must include 'q' field",
-        )
-    sessionId = payload.sessionId
-    if not sessionId:
+    return sanitize_llm_query(q, strict_mode=strict)
+
+
+# Longest accepted query; longer input is rejected before any session or sanitizer work
+_MAX_QUERY_CHARS = 4096
+
+
+def _reject_oversized_query(q: str) -> None:
+    """Raise INVALID_INPUT for queries longer than `_MAX_QUERY_CHARS`."""
+    if len(q) > _MAX_QUERY_CHARS:
         raise Error(
             ErrorCode.INVALID_INPUT,
-            details={"field": "sessionId"},
-            message="Request body must include 'sessionId' field",
+            details={"field": "q", "length": len(q), "max_length": _MAX_QUERY_CHARS},
+            message="Query too long",
         )
 
-    # Initialize or get session
-    session_info = await session_service.get_session_info(sessionId)
-    if not session_info:
-        await session_service.create_session(sessionId)
-        logger.info(f"Created new session: {sessionId}")
-    
-    # Add user message to conversation history
-    await session_service.add_conversation_message(sessionId, "user", q)
 
-    # Sanitize user input
-    sanitization_result = sanitize_llm_query(q, strict_mode=True)
+# Queries at least this long are sanitized in a worker thread instead of on the event loop
+_SANITIZE_OFFLOAD_MIN_CHARS = 1024
+
+
+async def _sanitize_query(q: str) -> SanitizationResult:
+    """Sanitize a user query in strict mode without stalling the event loop on long input.
+
+    Short queries cost less to sanitize than a thread hand-off, so they run inline.
+    """
+    if len(q) < _SANITIZE_OFFLOAD_MIN_CHARS:
+        return _sanitize_cached(q, True)
+    return await asyncio.to_thread(_sanitize_cached, q, True)
+
+
+async def _require_safe_query(q: str, kind: str = "query") -> str:
+    """Sanitize a user query and return its cleaned text.
+
+    Raises INVALID_INPUT when the sanitizer flags the query as unsafe; `kind` only labels the log
+    records.
+    """
+    sanitization_result = await _sanitize_query(q)
 
     if not sanitization_result.is_safe:
-        logger.warning(f"Unsafe query blocked: {sanitization_result.warnings}")
+        logger.warning("Unsafe %s blocked: %s", kind, sanitization_result.warnings)
         raise Error(
             ErrorCode.INVALID_INPUT,
             details={
@@ -130,60 +94,277 @@ async def query_shopping(
 
     # Log sanitization warnings but allow the query
     if sanitization_result.warnings:
-        logger.info(f"Query sanitized with warnings: {sanitization_result.warnings}")
-
-    sanitized_query = sanitization_result.sanitized_text
-    logger.info(
-        "handling shopping query",
-        extra={
-            "query": (
-                sanitized_query[:100] + "..." if len(sanitized_query) > 100 else sanitized_query
-            )
+        logger.info("Sanitized %s with warnings: %s", kind, sanitization_result.warnings)
+
+    return sanitization_result.sanitized_text
+
+
+# Graph answers only depend on the sanitized question, so they are shared across sessions
+_answer_cache = AsyncTTLCache(
+    maxsize=settings.answer_cache_max_entries, ttl=settings.answer_cache_ttl_seconds
+)
+
+
+# Encoded SSE frames of fully streamed, error-free answers, replayed for repeated questions
+_stream_cache = AsyncTTLCache(
+    maxsize=settings.answer_cache_max_entries, ttl=settings.answer_cache_ttl_seconds
+)
+
+
+def _is_cacheable_answer(result: dict[str, Any]) -> bool:
+    """Only cache confident answers from graph runs that completed without an error."""
+    return not result.get("error") and result.get("confidence") not in UNCACHEABLE_CONFIDENCE
+
+
+class _TruncatedText:
+    """Log argument that truncates long text only when the record is actually formatted."""
+
+    __slots__ = ("limit", "text")
+
+    def __init__(self, text: str, limit: int = 100):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self) -> str:
+        if len(self.text) > self.limit:
+            return self.text[: self.limit] + "..."
+        return self.text
+
+
+def _success_response(data: Any) -> ORJSONResponse:
+    """Serialize a successful `Response` envelope directly, skipping model validation."""
+    return ORJSONResponse({"success": True, "data": data, "meta": None, "error": None})
+
+
+# Pre-encoded Server-Sent Events framing
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+_SSE_DONE = b"data: [DONE]\n\n"
+# Error frame with everything but the exception message serialized up front
+_SSE_ERROR_PREFIX = (
+    b'data: {"chunk_type":"error","fallback":'
+    + orjson.dumps("I'm experiencing technical difficulties. Please try your question again.")
+    + b',"error":'
+)
+_SSE_ERROR_SUFFIX = b"}\n\n"
+
+# Upper bounds for merging adjacent streamed content chunks into a single SSE frame
+_SSE_BATCH_MAX_CHARS = 8 * 1024
+_SSE_BATCH_MAX_DELAY_SECONDS = 0.02
+
+# Maximum number of upstream chunks buffered ahead of the SSE writer
+_SSE_PREFETCH_MAX_CHUNKS = 32
+_PREFETCH_DONE = object()
+
+
+async def _prefetch_chunks(
+    chunks: AsyncIterator[dict[str, Any]],
+) -> AsyncIterator[dict[str, Any]]:
+    """Drain `chunks` from a background task into a bounded queue.
+
+    Upstream generation keeps running while the consumer frames and writes earlier chunks. An
+    upstream exception is re-raised to the consumer after the chunks that preceded it.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_SSE_PREFETCH_MAX_CHUNKS)
+
+    async def produce() -> None:
+        try:
+            async for chunk in chunks:
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_PREFETCH_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _PREFETCH_DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
+
+
+async def _coalesce_content_chunks(
+    chunks: AsyncIterator[dict[str, Any]],
+) -> AsyncIterator[dict[str, Any]]:
+    """Merge runs of adjacent 'content' chunks into one chunk.
+
+    A batch is flushed once it holds `_SSE_BATCH_MAX_CHARS` characters, once
+    `_SSE_BATCH_MAX_DELAY_SECONDS` have passed since its first token, or as soon as a chunk of any
+    other type arrives. All other chunks are passed through unchanged and in order.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = aiter(chunks)
+    pending: list[str] = []
+    pending_chars = 0
+    is_final = False
+    deadline = 0.0
+    next_chunk: asyncio.Future | None = None
+
+    def flush() -> dict[str, Any]:
+        nonlocal pending_chars
+        merged = {"chunk_type": "content", "content": "".join(pending), "is_final": is_final}
+        pending.clear()
+        pending_chars = 0
+        return merged
+
+    try:
+        while True:
+            if next_chunk is None:
+                next_chunk = asyncio.ensure_future(anext(iterator))
+
+            timeout = max(deadline - loop.time(), 0.0) if pending else None
+            done, _ = await asyncio.wait({next_chunk}, timeout=timeout)
+            if not done:
+                # Deadline reached while upstream is still producing the next token
+                yield flush()
+                continue
+
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_chunk = None
+
+            if chunk.get("chunk_type") == "content":
+                if not pending:
+                    deadline = loop.time() + _SSE_BATCH_MAX_DELAY_SECONDS
+                content = chunk.get("content") or ""
+                pending.append(content)
+                pending_chars += len(content)
+                is_final = chunk.get("is_final", False)
+                if pending_chars >= _SSE_BATCH_MAX_CHARS:
+                    yield flush()
+                continue
+
+            if pending:
+                yield flush()
+            yield chunk
+
+        if pending:
+            yield flush()
+    finally:
+        if next_chunk is not None:
+            next_chunk.cancel()
+
+
+# OpenAPI documentation shared by the query endpoints, built once at import
+_QUERY_EXAMPLES = {
+    "product_inquiry": {
+        "summary": "Product feature inquiry",
+        "description": "Ask about specific product features",
+        "value": {"q": "What are the features of your latest smartphone?"},
+    },
+    "general_question": {
+        "summary": "General shopping question",
+        "description": "General shopping-related inquiry",
+        "value": {"q": "Do you offer free shipping?"},
+    },
+    "comparison": {
+        "summary": "Product comparison",
+        "description": "Compare different products",
+        "value": {"q": "What's the difference between your Pro and Standard models?"},
+    },
+}
+
+_QUERY_RESPONSES = {
+    200: {
+        "model": Response,
+        "description": "Successful query response",
+        "content": {
+            "application/json": {
+                "example": {
+                    "status": "success",
+                    "data": "Our latest smartphones feature advanced AI cameras, 5G connectivity, and all-day battery life. The flagship model includes a 108MP camera system, 12GB RAM, and 256GB storage.",
+                    "message": "Query processed successfully",
+                    "timestamp": "2024-01-15T10:30:00Z",
+                }
+            }
         },
-    )
+    },
+    400: {
+        "description": "Invalid input or query too long",
+        "content": {
+            "application/json": {
+                "example": {
+                    "error": {
+                        "code": "invalid_input",
+                        "message": "Query contains potentially harmful content",
+                    }
+                }
+            }
+        },
+    },
+    413: {"description": "Request too large"},
+    429: {"description": "Rate limit exceeded"},
+}
+
+_QUERY_STREAM_RESPONSES = {
+    200: {
+        "description": "Successful streaming response",
+        "content": {
+            "text/event-stream": {
+                "example": 'data: {"chunk_type": "intent", "intent": "FAQ"}\n\ndata: {"chunk_type": "content", "content": "Our return policy..."}\n\n'
+            }
+        },
+    },
+    400: {"description": "Invalid input or query too long"},
+    413: {"description": "Request too large"},
+    429: {"description": "Rate limit exceeded"},
+}
 
-    result = await run_shopping_graph(sanitized_query)
+
+@router.post(
+    "/query",
+    summary="Query the shopping assistant",
+    description="Submit a shopping-related question and get an AI-powered answer",
+    responses=_QUERY_RESPONSES,
+)
+async def query_shopping(
+    payload: QueryPayload = Body(..., examples=_QUERY_EXAMPLES),
+) -> ORJSONResponse:
+    """Submit a shopping question and get an AI-powered answer.
+
+    This endpoint processes natural language questions about products, services, or shopping-related
+    inquiries using our RAG (Retrieval-Augmented Generation) system.
+    """
+    q = payload.q
+    sessionId = payload.sessionId
+    _reject_oversized_query(q)
+
+    # Initialize or refresh the session and record the user message
+    await session_service.touch_and_append(sessionId, "user", q)
+
+    # Sanitize user input
+    sanitized_query = await _require_safe_query(q)
+    logger.info("handling shopping query: %s", _TruncatedText(sanitized_query))
+
+    result = await _answer_cache.get_or_set(
+        sanitized_query,
+        lambda: run_shopping_graph(sanitized_query),
+        store_if=_is_cacheable_answer,
+    )
     
     # Add assistant response to conversation history
     await session_service.add_conversation_message(sessionId, "assistant", result)
     
-    return Response(success=True, data=result)
+    return _success_response(result)
 
 
 @router.post(
     "/query/stream",
     summary="Stream shopping assistant responses",
     description="Submit a shopping-related question and get an AI-powered answer streamed in real-time",
-    responses={
-        200: {
-            "description": "Successful streaming response",
-            "content": {
-                "text/plain": {
-                    "example": 'data: {"chunk_type": "intent", "intent": "FAQ"}\n\ndata: {"chunk_type": "content", "content": "Our return policy..."}\n\n'
-                }
-            },
-        },
-        400: {"description": "Invalid input or query too long"},
-        413: {"description": "Request too large"},
-        429: {"description": "Rate limit exceeded"},
-    },
+    responses=_QUERY_STREAM_RESPONSES,
 )
 async def query_shopping_stream(
-    payload: QueryPayload = Body(
-        ...,
-        examples={
-            "product_inquiry": {
-                "summary": "Product feature inquiry",
-                "description": "Ask about specific product features",
-                "value": {"q": "What are the features of your latest smartphone?"},
-            },
-            "general_question": {
-                "summary": "General shopping question",
-                "description": "General shopping-related inquiry",
-                "value": {"q": "Do you offer free shipping?"},
-            },
-        },
-    )
+    payload: QueryPayload = Body(..., examples=_QUERY_EXAMPLES),
 ):
     """Submit a shopping question and get an AI-powered answer streamed in real-time.
 
@@ -201,87 +382,53 @@ async def query_shopping_stream(
     """
     q = payload.q
     sessionId = payload.sessionId
-    
-    if not q:
-        raise Error(
-            ErrorCode.INVALID_INPUT,
-            details={"field": "q"},
-            message="Request body must include 'q' field",
-        )
-    
-    if not sessionId:
-        raise Error(
-            ErrorCode.INVALID_INPUT,
-            details={"field": "sessionId"},
-            message="Request body must include 'sessionId' field",
-        )
+    _reject_oversized_query(q)
 
-    # Initialize or get session
-    session_info = await session_service.get_session_info(sessionId)
-    if not session_info:
-        await session_service.create_session(sessionId)
-        logger.info(f"Created new streaming session: {sessionId}")
-    
-    # Add user message to conversation history
-    await session_service.add_conversation_message(sessionId, "user", q)
+    # Initialize or refresh the session and record the user message
+    await session_service.touch_and_append(sessionId, "user", q)
 
     # Sanitize user input (same as non-streaming)
-    sanitization_result = sanitize_llm_query(q, strict_mode=True)
-
-    if not sanitization_result.is_safe:
-        logger.warning(f"Unsafe streaming query blocked: {sanitization_result.warnings}")
-        raise Error(
-            ErrorCode.INVALID_INPUT,
-            details={
-                "field": "q",
-                "warnings": sanitization_result.warnings,
-                "reason": "Query contains potentially harmful content",
-            },
-            message="Query contains potentially harmful content and was blocked for security reasons",
-        )
-
-    # Log sanitization warnings but allow the query
-    if sanitization_result.warnings:
-        logger.info(f"Streaming query sanitized with warnings: {sanitization_result.warnings}")
-
-    sanitized_query = sanitization_result.sanitized_text
-    logger.info(
-        "handling streaming shopping query",
-        extra={
-            "query": (
-                sanitized_query[:100] + "..." if len(sanitized_query) > 100 else sanitized_query
-            )
-        },
-    )
+    sanitized_query = await _require_safe_query(q, "streaming query")
+    logger.info("handling streaming shopping query: %s", _TruncatedText(sanitized_query))
 
     async def stream_generator():
         """Generate SSE-formatted streaming response."""
         try:
-            async for chunk in run_shopping_graph_stream(sanitized_query):
+            cached_body = _stream_cache.get(sanitized_query)
+            if cached_body is not None:
+                # Replay a completed stream for the same question in a single write
+                yield cached_body
+                return
+
+            frames = []
+            cacheable = True
+            async for chunk in _coalesce_content_chunks(
+                _prefetch_chunks(run_shopping_graph_stream(sanitized_query))
+            ):
                 # Format as Server-Sent Events
-                chunk_json = json.dumps(chunk, ensure_ascii=False)
-                yield f"data: {chunk_json}\n\n"
-
-                # Add small delay to prevent overwhelming the client
-                await asyncio.sleep(0.01)
+                frame = _SSE_PREFIX + orjson.dumps(chunk) + _SSE_SUFFIX
+                frames.append(frame)
+                chunk_type = chunk.get("chunk_type")
+                if chunk_type == "error" or (
+                    chunk_type == "final" and chunk.get("confidence") in UNCACHEABLE_CONFIDENCE
+                ):
+                    cacheable = False
+                yield frame
+
+            if cacheable:
+                _stream_cache.set(sanitized_query, b"".join(frames))
 
         except Exception as e:
             logger.exception("Error in streaming response")
             # Send error chunk
-            error_chunk = {
-                "chunk_type": "error",
-                "error": str(e),
-                "fallback": "I'm experiencing technical difficulties. Please try your question again.",
-            }
-            error_json = json.dumps(error_chunk, ensure_ascii=False)
-            yield f"data: {error_json}\n\n"
+            yield _SSE_ERROR_PREFIX + orjson.dumps(str(e)) + _SSE_ERROR_SUFFIX
         finally:
             # Always send a final end-of-stream marker
-            yield "data: [DONE]\n\n"
+            yield _SSE_DONE
 
     return StreamingResponse(
         stream_generator(),
-        media_type="text/plain",
+        media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
@@ -290,8 +437,69 @@ async def query_shopping_stream(
     )
 
 
-@router.post("/add-documents")
-async def add_documents(payload: Any = Body(...)):
+# Documents sanitized per worker-thread hand-off, and how many batches may run at once
+_SANITIZE_BATCH_SIZE = 64
+_SANITIZE_MAX_CONCURRENCY = 8
+
+
+def _sanitize_document(doc: DocumentPayload) -> tuple[dict[str, Any], list[str]]:
+    """Sanitize a document's content, metadata and title for the RAG service.
+
+    Returns the service-ready document dict and any sanitization warnings.
+    """
+    warnings: list[str] = []
+
+    # Sanitize document content
+    content_result = sanitize_document_content(doc.get_text_content())
+    if content_result.warnings:
+        warnings.extend([f"Document {doc.id}: {w}" for w in content_result.warnings])
+
+    # Sanitize metadata
+    sanitized_metadata, metadata_warnings = validate_document_metadata(doc.metadata or {})
+    if metadata_warnings:
+        warnings.extend([f"Document {doc.id} metadata: {w}" for w in metadata_warnings])
+
+    if not doc.title:
+        doc_dict = {
+            "id": doc.id,
+            "text": content_result.sanitized_text,
+            "metadata": sanitized_metadata,
+        }
+        return doc_dict, warnings
+
+    # Sanitize the optional title, which is also mirrored into the metadata
+    title_result = sanitize_document_content(doc.title)
+    if title_result.warnings:
+        warnings.extend([f"Document {doc.id} title: {w}" for w in title_result.warnings])
+
+    title = title_result.sanitized_text
+    doc_dict = {
+        "id": doc.id,
+        "text": content_result.sanitized_text,
+        "metadata": {**sanitized_metadata, "title": title},
+        "title": title,
+    }
+    return doc_dict, warnings
+
+
+def _sanitize_documents(
+    docs: list[DocumentPayload],
+) -> list[tuple[dict[str, Any], list[str]]]:
+    """Sanitize a batch of documents within a single worker-thread call."""
+    return [_sanitize_document(doc) for doc in docs]
+
+
+# The body is decoded by hand, so describe it for OpenAPI explicitly
+_ADD_DOCUMENTS_OPENAPI = {
+    "requestBody": {
+        "content": {"application/json": {"schema": {"title": "Payload"}}},
+        "required": True,
+    }
+}
+
+
+@router.post("/add-documents", openapi_extra=_ADD_DOCUMENTS_OPENAPI)
+async def add_documents(request: Request):
     """Add documents to the retriever with proper validation.
 
     Accepts either:
@@ -305,71 +513,49 @@ async def add_documents(payload: Any = Body(...)):
     - metadata: Optional additional metadata
     """
     try:
-        # Parse and validate documents using our flexible parser
+        # Decode with orjson (invalid JSON raises a ValueError subclass) and validate the shape
+        payload = orjson.loads(await request.body())
         documents = BulkDocumentPayload.parse_flexible(payload)
 
-        logger.info(f"Validated {len(documents)} documents for ingestion")
+        logger.info("Validated %d documents for ingestion", len(documents))
 
-        # Convert Pydantic models to dictionaries for the service with sanitization
-        docs_for_service = []
-        sanitization_warnings = []
+        # Sanitize documents off the event loop, bounded to avoid exhausting the thread pool
+        semaphore = asyncio.Semaphore(_SANITIZE_MAX_CONCURRENCY)
 
-        for doc in documents:
-            # Sanitize document content
-            content = doc.get_text_content()
-            content_result = sanitize_document_content(content)
-
-            if content_result.warnings:
-                sanitization_warnings.extend(
-                    [f"Document {doc.id}: {w}" for w in content_result.warnings]
-                )
-
-            # Sanitize metadata
-            sanitized_metadata, metadata_warnings = validate_document_metadata(doc.metadata or {})
-            if metadata_warnings:
-                sanitization_warnings.extend(
-                    [f"Document {doc.id} metadata: {w}" for w in metadata_warnings]
-                )
-
-            doc_dict = {
-                "id": doc.id,
-                "text": content_result.sanitized_text,
-                "metadata": sanitized_metadata,
-            }
+        async def sanitize(
+            batch: list[DocumentPayload],
+        ) -> list[tuple[dict[str, Any], list[str]]]:
+            async with semaphore:
+                return await asyncio.to_thread(_sanitize_documents, batch)
 
-            # Add optional fields if present (also sanitize title)
-            if doc.title:
-                title_result = sanitize_document_content(doc.title)
-                doc_dict["title"] = title_result.sanitized_text
-                doc_dict["metadata"]["title"] = title_result.sanitized_text
-                if title_result.warnings:
-                    sanitization_warnings.extend(
-                        [f"Document {doc.id} title: {w}" for w in title_result.warnings]
-                    )
+        batches = [
+            documents[i : i + _SANITIZE_BATCH_SIZE]
+            for i in range(0, len(documents), _SANITIZE_BATCH_SIZE)
+        ]
+        sanitized = await asyncio.gather(*(sanitize(batch) for batch in batches))
 
+        docs_for_service = []
+        processed_ids = []
+        sanitization_warnings = []
+        for doc_dict, doc_warnings in chain.from_iterable(sanitized):
             docs_for_service.append(doc_dict)
+            processed_ids.append(doc_dict["id"])
+            sanitization_warnings.extend(doc_warnings)
 
-        # Log sanitization warnings
-        if sanitization_warnings:
-            logger.info(
-                f"Document sanitization warnings: {sanitization_warnings[:10]}"
-            )  # Log first 10
+        # Log the first 10 sanitization warnings
+        if sanitization_warnings and logger.isEnabledFor(logging.INFO):
+            logger.info("Document sanitization warnings: %s", sanitization_warnings[:10])
 
         # Call service to add documents
         result = await rag_add_documents(docs_for_service)
 
-        logger.info(f"Successfully processed {len(documents)} documents")
-        return Response(
-            success=True,
-            data={
-                "message": result,
-                "count": len(documents),
-                "processed_ids": [doc.id for doc in documents],
-            },
+        logger.info("Successfully processed %d documents", len(documents))
+        return _success_response(
+            {"message": result, "count": len(documents), "processed_ids": processed_ids}
         )
 
     except ValidationError as e:
-        logger.warning(f"Document validation failed: {e}")
+        logger.warning("Document validation failed: %s", e)
         raise Error(
             ErrorCode.INVALID_INPUT,
             details={"validation_errors": e.errors()},
@@ -377,7 +563,7 @@ async def add_documents(payload: Any = Body(...)):
         ) from e
 
     except ValueError as e:
-        logger.warning(f"Document parsing failed: {e}")
+        logger.warning("Document parsing failed: %s", e)
         raise Error(ErrorCode.INVALID_INPUT, details={"error": str(e)}, message=str(e)) from e
 
     except Exception as e:
@@ -403,9 +589,8 @@ async def get_session_info(session_id: str):
         
         analytics = await session_service.get_session_analytics(session_id)
         
-        return Response(
-            success=True,
-            data={
+        return _success_response(
+            {
                 "session_info": session_info,
                 "analytics": analytics
             }
@@ -414,7 +599,7 @@ async def get_session_info(session_id: str):
     except Error:
         raise
     except Exception as e:
-        logger.exception(f"Failed to get session info for {session_id}")
+        logger.exception("Failed to get session info for %s", session_id)
         raise Error(
             ErrorCode.INTERNAL_ERROR,
             details={"error": str(e)},
@@ -428,9 +613,8 @@ async def get_conversation_history(session_id: str, limit: int = 20):
     try:
         conversation = await session_service.get_conversation_history(session_id, limit=limit)
         
-        return Response(
-            success=True,
-            data={
+        return _success_response(
+            {
                 "session_id": session_id,
                 "conversation": conversation,
                 "count": len(conversation)
@@ -438,7 +622,7 @@ async def get_conversation_history(session_id: str, limit: int = 20):
         )
         
     except Exception as e:
-        logger.exception(f"Failed to get conversation history for {session_id}")
+        logger.exception("Failed to get conversation history for %s", session_id)
         raise Error(
             ErrorCode.INTERNAL_ERROR,
             details={"error": str(e)},
@@ -459,9 +643,8 @@ async def update_preferences(session_id: str, preferences: dict = Body(...)):
                 message="Session not found",
             )
         
-        return Response(
-            success=True,
-            data={
+        return _success_response(
+            {
                 "message": "Preferences updated successfully",
                 "session_id": session_id,
                 "preferences": preferences
@@ -471,7 +654,7 @@ async def update_preferences(session_id: str, preferences: dict = Body(...)):
     except Error:
         raise
     except Exception as e:
-        logger.exception(f"Failed to update preferences for {session_id}")
+        logger.exception("Failed to update preferences for %s", session_id)
         raise Error(
             ErrorCode.INTERNAL_ERROR,
             details={"error": str(e)},
@@ -485,9 +668,8 @@ async def get_shopping_cart(session_id: str):
     try:
         cart = await session_service.get_shopping_cart(session_id)
         
-        return Response(
-            success=True,
-            data={
+        return _success_response(
+            {
                 "session_id": session_id,
                 "cart": cart,
                 "item_count": len(cart)
@@ -495,7 +677,7 @@ async def get_shopping_cart(session_id: str):
         )
         
     except Exception as e:
-        logger.exception(f"Failed to get shopping cart for {session_id}")
+        logger.exception("Failed to get shopping cart for %s", session_id)
         raise Error(
             ErrorCode.INTERNAL_ERROR,
             details={"error": str(e)},
@@ -516,9 +698,8 @@ async def add_to_cart(session_id: str, item: dict = Body(...)):
                 message="Session not found",
             )
         
-        return Response(
-            success=True,
-            data={
+        return _success_response(
+            {
                 "message": "Item added to cart successfully",
                 "session_id": session_id,
                 "item": item
@@ -528,7 +709,7 @@ async def add_to_cart(session_id: str, item: dict = Body(...)):
     except Error:
         raise
     except Exception as e:
-        logger.exception(f"Failed to add item to cart for {session_id}")
+        logger.exception("Failed to add item to cart for %s", session_id)
         raise Error(
             ErrorCode.INTERNAL_ERROR,
             details={"error": str(e)},
@@ -549,9 +730,8 @@ async def clear_cart(session_id: str):
                 message="Session not found",
             )
         
-        return Response(
-            success=True,
-            data={
+        return _success_response(
+            {
                 "message": "Cart cleared successfully",
                 "session_id": session_id
             }
@@ -560,7 +740,7 @@ async def clear_cart(session_id: str):
     except Error:
         raise
     except Exception as e:
-        logger.exception(f"Failed to clear cart for {session_id}")
+        logger.exception("Failed to clear cart for %s", session_id)
         raise Error(
             ErrorCode.INTERNAL_ERROR,
             details={"error": str(e)},
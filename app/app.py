@@ -1,22 +1,82 @@
+import asyncio
 import time
+from collections.abc import Awaitable
+from collections.abc import Callable
 from contextlib import asynccontextmanager
-from datetime import datetime
+from contextlib import suppress
 from typing import Any
 
+import orjson
 from fastapi import FastAPI
 from fastapi import Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from fastapi.responses import Response as RawResponse
 
 from app.api.v1 import routes
+from app.config import settings
+from app.database.redis_client import close_redis_connections
+from app.database.redis_client import get_redis_info
+from app.database.redis_client import ping
+from app.graphs.shopping_graph import embeddings as graph_embeddings
+from app.graphs.shopping_graph import get_llm_client as get_graph_llm_client
+from app.graphs.shopping_graph import get_retriever as get_graph_retriever
+from app.middleware.cors import PathExcludingCORSMiddleware
 from app.middleware.rate_limiting import RateLimitingMiddleware
 from app.middleware.request_size_limit import RequestSizeLimitMiddleware
+from app.models.response import ErrorModel
 from app.models.response import Response
+from app.services.rag_service import _rag_service
 from app.utils.errors import APIError
 from app.utils.errors import to_error_dict
 from app.utils.logger import get_logger
 from app.utils.logger import setup_logging
 
+_NO_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+
+def _utc_timestamp() -> str:
+    """Return the current UTC time as an ISO 8601 string with a trailing Z."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+async def _tick_probe_bodies(app: FastAPI) -> None:
+    """Re-render the pre-serialized health and liveness bodies once a second."""
+    while True:
+        await asyncio.sleep(1)
+        app.state.refresh_probe_bodies()
+
+
+async def _warm_up_graph() -> None:
+    """Pay the graph's cold-start costs before the first request does.
+
+    Connects to Weaviate and primes its search path, and loads the embedding model in Ollama. With
+    `llm_warmup_enabled`, also opens the Groq connection with a (billed) one-token completion.
+    Failures are only logged; requests retry on their own.
+    """
+    logger = get_logger("app.startup")
+    # Connecting does blocking network I/O, so keep it off the event loop. The RAG service's
+    # retriever is connected here too, rather than by the first request or readiness probe.
+    retriever, _ = await asyncio.gather(
+        asyncio.to_thread(get_graph_retriever),
+        asyncio.to_thread(getattr, _rag_service, "retriever"),
+    )
+
+    async def warm(name: str, awaitable: Awaitable[Any]) -> None:
+        try:
+            await awaitable
+        except Exception as e:
+            logger.warning("%s warm-up failed: %s", name, e)
+
+    warmups = [warm("Embedding", graph_embeddings.aembed_query("warmup"))]
+    if settings.llm_warmup_enabled:
+        warmups.append(warm("LLM", get_graph_llm_client().llm.bind(max_tokens=1).ainvoke("ping")))
+    if retriever is not None:
+        warmups.append(
+            warm("Retriever", asyncio.to_thread(retriever.similarity_search, "warmup", k=1))
+        )
+    await asyncio.gather(*warmups)
+    logger.info("Graph warm-up completed")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -25,10 +85,8 @@ async def lifespan(app: FastAPI):
     logger = get_logger("app.startup")
     logger.info("Application startup initiated")
 
-    # Pre-warm Redis connection
+    # Create the Redis pool and open a pooled connection before the first request needs it
     try:
-        from app.database.redis_client import ping
-
         if await ping():
             logger.info("Redis connection established")
         else:
@@ -36,6 +94,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Redis initialization error: {e}")
 
+    probe_ticker = asyncio.create_task(_tick_probe_bodies(app))
+
+    # Connect the retriever and warm up in the background rather than inside the first request
+    warm_up = asyncio.create_task(_warm_up_graph())
+
     logger.info("Application startup completed")
 
     yield  # Application runs here
@@ -44,10 +107,13 @@ async def lifespan(app: FastAPI):
     logger = get_logger("app.shutdown")
     logger.info("Application shutdown initiated")
 
+    for task in (probe_ticker, warm_up):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
     # Close Redis connections
     try:
-        from app.database.redis_client import close_redis_connections
-
         await close_redis_connections()
         logger.info("Redis connections closed")
     except Exception as e:
@@ -57,8 +123,6 @@ async def lifespan(app: FastAPI):
 
 
 def create_app() -> FastAPI:
-    from app.config import settings
-
     setup_logging(
         enabled=settings.logging_enabled,
         level=getattr(__import__("logging"), settings.log_level.upper(), 20),
@@ -67,7 +131,9 @@ def create_app() -> FastAPI:
     logger = get_logger("app.startup")
     logger.info("starting application", extra={"logging_enabled": settings.logging_enabled})
 
-    app = FastAPI(title="Shopping Assistant", lifespan=lifespan)
+    app = FastAPI(
+        title="Shopping Assistant", lifespan=lifespan, default_response_class=ORJSONResponse
+    )
 
     # Add rate limiting middleware
     app.add_middleware(RateLimitingMiddleware, enabled=settings.rate_limiting_enabled)
@@ -79,9 +145,10 @@ def create_app() -> FastAPI:
         exclude_paths=["/health", "/docs", "/openapi.json"],
     )
 
-    # Allow requests from local frontend during development
+    # Allow requests from local frontend during development; probes never need CORS headers
     app.add_middleware(
-        CORSMiddleware,
+        PathExcludingCORSMiddleware,
+        exclude_paths=["/health"],
         allow_origins=["http://localhost:3000"],
         allow_credentials=True,
         allow_methods=["*"],
@@ -99,27 +166,28 @@ def create_app() -> FastAPI:
     @app.exception_handler(APIError)
     async def api_error_handler(request: Request, exc: APIError):
         logger = get_logger("app.errors")
+        error = to_error_dict(exc)
         # log error with request context
         logger.error(
-            f"APIError: {exc.code}",
+            "APIError: %s",
+            exc.code,
             extra={
                 "path": request.url.path,
                 "method": request.method,
                 "client": request.client.host if request.client else None,
-                "error": to_error_dict(exc),
+                "error": error,
             },
         )
-        payload = Response(success=False, error=to_error_dict(exc))
-        return JSONResponse(status_code=exc.http_status, content=payload.dict())
+        # Built from our own APIError, so skip validation
+        payload = Response.model_construct(success=False, error=ErrorModel.model_construct(**error))
+        return ORJSONResponse(status_code=exc.http_status, content=payload.model_dump(mode="json"))
 
     # Application startup time for health checks
-    app_start_time = time.time()
+    app_start_time = time.monotonic()
 
     async def check_redis_health() -> dict[str, Any]:
         """Check Redis service health."""
         try:
-            from app.database.redis_client import get_redis_info
-
             redis_info = await get_redis_info()
             return {
                 "service": "redis",
@@ -129,15 +197,28 @@ def create_app() -> FastAPI:
         except Exception as e:
             return {"service": "redis", "healthy": False, "error": str(e)}
 
+    # Per-refresh retriever checks, keyed by object so a retriever shared by services is probed once
+    retriever_checks: dict[int, asyncio.Future[bool]] = {}
+
+    def check_retriever_health(retriever: Any) -> Awaitable[bool]:
+        """Health-check a retriever at most once per readiness refresh."""
+        check = retriever_checks.get(id(retriever))
+        if check is None:
+            # health_check() does blocking network I/O, so keep it off the event loop
+            check = asyncio.ensure_future(asyncio.to_thread(retriever.health_check))
+            retriever_checks[id(retriever)] = check
+        # Shielded so one service's check timing out doesn't cancel the shared probe
+        return asyncio.shield(check)
+
     async def check_rag_service_health() -> dict[str, Any]:
         """Check RAG service health."""
         try:
-            from app.services.rag_service import _rag_service
-
             # Check if retriever is initialized
             retriever_healthy = False
-            if _rag_service.retriever:
-                retriever_healthy = _rag_service.retriever.health_check()
+            # Connects on first access, so resolve it off the event loop
+            rag_retriever = await asyncio.to_thread(getattr, _rag_service, "retriever")
+            if rag_retriever:
+                retriever_healthy = await check_retriever_health(rag_retriever)
 
             # Check if LLM client is configured
             llm_healthy = _rag_service.llm_client.is_configured()
@@ -156,16 +237,14 @@ def create_app() -> FastAPI:
     async def check_graph_service_health() -> dict[str, Any]:
         """Check LangGraph service health."""
         try:
-            from app.graphs.shopping_graph import llm_client
-            from app.graphs.shopping_graph import retriever
-
             # Check LLM client
-            llm_healthy = llm_client.is_configured()
+            llm_healthy = get_graph_llm_client().is_configured()
 
             # Check retriever if available
             retriever_healthy = True
-            if retriever:
-                retriever_healthy = retriever.health_check()
+            graph_retriever = await asyncio.to_thread(get_graph_retriever)
+            if graph_retriever:
+                retriever_healthy = await check_retriever_health(graph_retriever)
 
             return {
                 "service": "graph",
@@ -178,6 +257,61 @@ def create_app() -> FastAPI:
         except Exception as e:
             return {"service": "graph", "healthy": False, "error": str(e)}
 
+    async def run_health_check(
+        service: str, check: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> dict[str, Any]:
+        """Run a dependency check, reporting it unhealthy if it fails or exceeds the timeout."""
+        try:
+            return await asyncio.wait_for(check(), timeout=settings.health_check_timeout_seconds)
+        except TimeoutError:
+            return {"service": service, "healthy": False, "error": "health check timed out"}
+        except Exception as e:
+            return {"service": service, "healthy": False, "error": str(e)}
+
+    # Readiness results are reused briefly so frequent probes don't all hit the dependencies
+    readiness_cache: dict[str, Any] = {"expires_at": 0.0, "status_code": 503, "content": None}
+    readiness_lock = asyncio.Lock()
+
+    async def refresh_readiness() -> None:
+        retriever_checks.clear()
+        # Run all dependency checks concurrently so the probe takes as long as the slowest one
+        checks = await asyncio.gather(
+            run_health_check("redis", check_redis_health),
+            run_health_check("rag", check_rag_service_health),
+            run_health_check("graph", check_graph_service_health),
+        )
+        overall_healthy = all(check["healthy"] for check in checks)
+
+        readiness_cache["content"] = {
+            "status": "ready" if overall_healthy else "not_ready",
+            "timestamp": _utc_timestamp(),
+            "uptime_seconds": int(time.monotonic() - app_start_time),
+            "services": checks,
+        }
+        readiness_cache["status_code"] = 200 if overall_healthy else 503
+        readiness_cache["expires_at"] = time.monotonic() + settings.health_check_cache_seconds
+
+    probe_bodies: dict[str, bytes] = {}
+
+    def refresh_probe_bodies() -> None:
+        timestamp = _utc_timestamp()
+        uptime_seconds = int(time.monotonic() - app_start_time)
+        probe_bodies["health"] = orjson.dumps(
+            {
+                "status": "healthy",
+                "timestamp": timestamp,
+                "uptime_seconds": uptime_seconds,
+                "version": "0.1.0",
+            }
+        )
+        probe_bodies["live"] = orjson.dumps(
+            {"status": "alive", "timestamp": timestamp, "uptime_seconds": uptime_seconds}
+        )
+
+    # Rendered now and then once a second by the lifespan ticker, never per request
+    refresh_probe_bodies()
+    app.state.refresh_probe_bodies = refresh_probe_bodies
+
     @app.get("/health", tags=["Health"], summary="Basic health check")
     async def health_check():
         """
@@ -186,12 +320,11 @@ def create_app() -> FastAPI:
         This is a lightweight check that only verifies the application is responsive.
         Use /health/ready for comprehensive dependency checks.
         """
-        return {
-            "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "uptime_seconds": int(time.time() - app_start_time),
-            "version": "0.1.0",
-        }
+        return RawResponse(
+            content=probe_bodies["health"],
+            media_type="application/json",
+            headers=_NO_CACHE_HEADERS,
+        )
 
     @app.get("/health/ready", tags=["Health"], summary="Readiness probe")
     async def readiness_check():
@@ -200,36 +333,15 @@ def create_app() -> FastAPI:
         Returns 200 if all services are ready, 503 if any service is unavailable. Used by Kubernetes
         readiness probes and load balancers.
         """
-        checks = []
-        overall_healthy = True
-
-        # Check Redis service
-        redis_health = await check_redis_health()
-        checks.append(redis_health)
-        if not redis_health["healthy"]:
-            overall_healthy = False
-
-        # Check RAG service
-        rag_health = await check_rag_service_health()
-        checks.append(rag_health)
-        if not rag_health["healthy"]:
-            overall_healthy = False
-
-        # Check Graph service
-        graph_health = await check_graph_service_health()
-        checks.append(graph_health)
-        if not graph_health["healthy"]:
-            overall_healthy = False
-
-        response_data = {
-            "status": "ready" if overall_healthy else "not_ready",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "uptime_seconds": int(time.time() - app_start_time),
-            "services": checks,
-        }
-
-        status_code = 200 if overall_healthy else 503
-        return JSONResponse(status_code=status_code, content=response_data)
+        if time.monotonic() >= readiness_cache["expires_at"]:
+            async with readiness_lock:
+                # Re-check: another probe may have refreshed the result while we waited
+                if time.monotonic() >= readiness_cache["expires_at"]:
+                    await refresh_readiness()
+
+        return ORJSONResponse(
+            status_code=readiness_cache["status_code"], content=readiness_cache["content"]
+        )
 
     @app.get("/health/live", tags=["Health"], summary="Liveness probe")
     async def liveness_check():
@@ -238,11 +350,7 @@ def create_app() -> FastAPI:
         Returns 200 if the application process is alive and responsive. Should only fail if the
         application needs to be restarted.
         """
-        return {
-            "status": "alive",
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "uptime_seconds": int(time.time() - app_start_time),
-        }
+        return RawResponse(content=probe_bodies["live"], media_type="application/json")
 
     return app
 
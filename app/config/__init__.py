@@ -1,4 +1,5 @@
 from .config import get_allowed_api_keys
+from .config import get_settings
 from .config import settings
 
-__all__ = ["get_allowed_api_keys", "settings"]
+__all__ = ["get_allowed_api_keys", "get_settings", "settings"]
@@ -3,10 +3,29 @@
 Enhanced with environment-specific configuration support.
 """
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 from app.config.environment import get_environment_config
 
+# Settings that the per-environment YAML configuration takes precedence over
+_ENVIRONMENT_OVERRIDE_FIELDS = (
+    "logging_enabled",
+    "log_level",
+    "require_api_key",
+    "rate_limiting_enabled",
+    "redis_max_connections",
+    "default_temperature",
+    "llm_timeout_seconds",
+    "api_request_timeout_seconds",
+    "cache_ttl_seconds",
+    "weaviate_timeout_seconds",
+    "health_check_timeout_seconds",
+    "rate_limit_requests_per_minute",
+    "rate_limit_requests_per_hour",
+)
+
 
 class Settings(BaseSettings):
     api_keys: str = ""
@@ -19,10 +38,24 @@ class Settings(BaseSettings):
     # Redis / caching
     redis_url: str = "redis://127.0.0.1:6379"
     cache_ttl_seconds: int = 300
+    answer_cache_ttl_seconds: int = 60
+    answer_cache_max_entries: int = 1024
+    semantic_cache_enabled: bool = True
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_max_entries: int = 4096
+    retrieval_cache_threshold: float = 0.97
+    retrieval_cache_max_entries: int = 512
+    retrieval_cache_ttl_seconds: int = 600
+    faq_answer_cache_max_entries: int = 2048
+    faq_answer_cache_ttl_seconds: int = 3600
+    intent_cache_max_entries: int = 2048
+    intent_cache_ttl_seconds: int = 600
     redis_max_connections: int = 10
     # LLM settings
     default_temperature: float = 0.0
     llm_timeout_seconds: int = 30
+    # Send a one-token completion at startup to open the Groq connection (billed per start)
+    llm_warmup_enabled: bool = False
     # OpenAI API key
     OPENAI_API_KEY: str = ""
     # Groq API key
@@ -36,6 +69,7 @@ class Settings(BaseSettings):
     # Request timeouts
     api_request_timeout_seconds: int = 60
     health_check_timeout_seconds: int = 5
+    health_check_cache_seconds: int = 10
     # Rate limiting
     rate_limiting_enabled: bool = True
     rate_limit_requests_per_minute: int = 60
@@ -49,33 +83,8 @@ class Settings(BaseSettings):
         try:
             env_config = get_environment_config()
 
-            # Apply environment-specific overrides
-            if hasattr(env_config, "logging_enabled"):
-                self.logging_enabled = env_config.logging_enabled
-            if hasattr(env_config, "log_level"):
-                self.log_level = env_config.log_level
-            if hasattr(env_config, "require_api_key"):
-                self.require_api_key = env_config.require_api_key
-            if hasattr(env_config, "rate_limiting_enabled"):
-                self.rate_limiting_enabled = env_config.rate_limiting_enabled
-            if hasattr(env_config, "redis_max_connections"):
-                self.redis_max_connections = env_config.redis_max_connections
-            if hasattr(env_config, "default_temperature"):
-                self.default_temperature = env_config.default_temperature
-            if hasattr(env_config, "llm_timeout_seconds"):
-                self.llm_timeout_seconds = env_config.llm_timeout_seconds
-            if hasattr(env_config, "api_request_timeout_seconds"):
-                self.api_request_timeout_seconds = env_config.api_request_timeout_seconds
-            if hasattr(env_config, "cache_ttl_seconds"):
-                self.cache_ttl_seconds = env_config.cache_ttl_seconds
-            if hasattr(env_config, "weaviate_timeout_seconds"):
-                self.weaviate_timeout_seconds = env_config.weaviate_timeout_seconds
-            if hasattr(env_config, "health_check_timeout_seconds"):
-                self.health_check_timeout_seconds = env_config.health_check_timeout_seconds
-            if hasattr(env_config, "rate_limit_requests_per_minute"):
-                self.rate_limit_requests_per_minute = env_config.rate_limit_requests_per_minute
-            if hasattr(env_config, "rate_limit_requests_per_hour"):
-                self.rate_limit_requests_per_hour = env_config.rate_limit_requests_per_hour
+            for field in _ENVIRONMENT_OVERRIDE_FIELDS:
+                setattr(self, field, getattr(env_config, field))
 
         except Exception as e:
             # Don't fail if environment config is not available
@@ -84,12 +93,20 @@ class Settings(BaseSettings):
             logging.warning(f"Failed to apply environment overrides: {e}")
 
 
-# Create settings instance and apply environment overrides
-settings = Settings()
-settings.apply_environment_overrides()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once, with environment overrides applied, and reuse them afterwards."""
+    settings = Settings()
+    settings.apply_environment_overrides()
+    return settings
+
+
+settings = get_settings()
 
 
-def get_allowed_api_keys() -> list[str]:
+@lru_cache(maxsize=1)
+def get_allowed_api_keys() -> frozenset[str]:
+    """Parse the configured API keys once; call `get_allowed_api_keys.cache_clear()` to reload."""
     if not settings.api_keys:
-        return []
-    return [k.strip() for k in settings.api_keys.split(",") if k.strip()]
+        return frozenset()
+    return frozenset(k.strip() for k in settings.api_keys.split(",") if k.strip())
@@ -7,6 +7,7 @@ variables and defaults.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -72,6 +73,43 @@ class EnvironmentConfig(BaseModel):
     fast_startup: bool = False
 
 
+# Mapping of config keys to the environment variables that override them
+_ENV_VAR_MAPPING = {
+    "debug": "DEBUG",
+    "logging_enabled": "LOGGING_ENABLED",
+    "log_level": "LOG_LEVEL",
+    "require_api_key": "REQUIRE_API_KEY",
+    "rate_limiting_enabled": "RATE_LIMITING_ENABLED",
+    "redis_max_connections": "REDIS_MAX_CONNECTIONS",
+    "default_temperature": "DEFAULT_TEMPERATURE",
+    "llm_timeout_seconds": "LLM_TIMEOUT_SECONDS",
+    "api_request_timeout_seconds": "API_REQUEST_TIMEOUT_SECONDS",
+    "cache_ttl_seconds": "CACHE_TTL_SECONDS",
+}
+_BOOL_KEYS = frozenset({"debug", "logging_enabled", "require_api_key", "rate_limiting_enabled"})
+_INT_KEYS = frozenset(
+    {
+        "redis_max_connections",
+        "llm_timeout_seconds",
+        "api_request_timeout_seconds",
+        "cache_ttl_seconds",
+    }
+)
+_FLOAT_KEYS = frozenset({"default_temperature"})
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _parse_yaml_file(path: str, mtime_ns: int) -> dict[str, Any]:
+    """Parse a YAML config file; cached per path and modification time."""
+    with open(path) as f:
+        config = yaml.load(f, Loader=_YAML_LOADER) or {}
+    logger.info(f"Loaded configuration from {path}")
+    return config
+
+
 class ConfigLoader:
     """Load and manage environment-specific configurations."""
 
@@ -107,52 +145,26 @@ class ConfigLoader:
             return {}
 
         try:
-            with open(config_file) as f:
-                config = yaml.safe_load(f) or {}
-            logger.info(f"Loaded configuration from {config_file}")
-            return config
+            # Keyed on mtime so an edited file is re-read; copied so callers can't mutate the cache
+            return dict(_parse_yaml_file(str(config_file), config_file.stat().st_mtime_ns))
         except Exception as e:
             logger.error(f"Failed to load configuration from {config_file}: {e}")
             return {}
 
     def _merge_with_env_vars(self, config: dict[str, Any]) -> dict[str, Any]:
         """Merge configuration with environment variables."""
-        # Define mapping of config keys to environment variable names
-        env_var_mapping = {
-            "debug": "DEBUG",
-            "logging_enabled": "LOGGING_ENABLED",
-            "log_level": "LOG_LEVEL",
-            "require_api_key": "REQUIRE_API_KEY",
-            "rate_limiting_enabled": "RATE_LIMITING_ENABLED",
-            "redis_max_connections": "REDIS_MAX_CONNECTIONS",
-            "default_temperature": "DEFAULT_TEMPERATURE",
-            "llm_timeout_seconds": "LLM_TIMEOUT_SECONDS",
-            "api_request_timeout_seconds": "API_REQUEST_TIMEOUT_SECONDS",
-            "cache_ttl_seconds": "CACHE_TTL_SECONDS",
-        }
-
-        for config_key, env_var in env_var_mapping.items():
+        for config_key, env_var in _ENV_VAR_MAPPING.items():
             env_value = os.getenv(env_var)
             if env_value is not None:
                 # Convert string values to appropriate types
-                if config_key in [
-                    "debug",
-                    "logging_enabled",
-                    "require_api_key",
-                    "rate_limiting_enabled",
-                ]:
+                if config_key in _BOOL_KEYS:
                     config[config_key] = env_value.lower() in ("true", "1", "yes", "on")
-                elif config_key in [
-                    "redis_max_connections",
-                    "llm_timeout_seconds",
-                    "api_request_timeout_seconds",
-                    "cache_ttl_seconds",
-                ]:
+                elif config_key in _INT_KEYS:
                     try:
                         config[config_key] = int(env_value)
                     except ValueError:
                         logger.warning(f"Invalid integer value for {env_var}: {env_value}")
-                elif config_key == "default_temperature":
+                elif config_key in _FLOAT_KEYS:
                     try:
                         config[config_key] = float(env_value)
                     except ValueError:
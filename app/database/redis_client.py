@@ -10,6 +10,7 @@ Provides a robust Redis connection with:
 from __future__ import annotations
 
 import asyncio
+import random
 import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -30,11 +31,13 @@ class RedisManager:
     def __init__(self):
         self._client: redis.Redis | None = None
         self._pool: ConnectionPool | None = None
-        self._last_health_check = 0
+        self._next_health_check_at = 0.0
         self._health_check_interval = 30  # seconds
         self._is_healthy = True
         self._consecutive_failures = 0
         self._max_failures = 3
+        self._circuit_opened_at = 0.0
+        self._circuit_cooldown = 10.0  # seconds
 
     async def _create_pool(self) -> ConnectionPool:
         """Create Redis connection pool with proper configuration."""
@@ -46,8 +49,7 @@ class RedisManager:
             health_check_interval=30,
             socket_connect_timeout=5,
             socket_timeout=5,
-            decode_responses=True,
-            encoding="utf-8",
+            # Replies stay as bytes; the JSON decoders accept them directly
         )
 
     async def _initialize_client(self) -> redis.Redis:
@@ -66,19 +68,17 @@ class RedisManager:
             return client
         except Exception as e:
             logger.warning(f"Failed to initialize Redis client: {e}")
-            self._consecutive_failures += 1
-            self._is_healthy = False
+            self._record_failure()
             # Return client anyway - it might work later
             return client
 
     async def get_client(self) -> redis.Redis:
         """Get Redis client with health check and auto-recovery."""
-        current_time = time.time()
-
-        # Check if we need a health check
-        if (current_time - self._last_health_check) > self._health_check_interval:
+        # Scheduled as a deadline so the common path is a single comparison
+        now = time.monotonic()
+        if now >= self._next_health_check_at:
             await self._health_check()
-            self._last_health_check = current_time
+            self._next_health_check_at = now + self._health_check_interval
 
         # Initialize client if needed
         if self._client is None or not self._is_healthy:
@@ -109,10 +109,23 @@ class RedisManager:
             return True
         except Exception as e:
             logger.warning(f"Redis health check failed: {e}")
-            self._is_healthy = False
-            self._consecutive_failures += 1
+            self._record_failure()
             return False
 
+    def _record_failure(self) -> None:
+        """Mark the connection unhealthy, opening the circuit once failures reach the limit."""
+        self._is_healthy = False
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self._max_failures:
+            self._circuit_opened_at = time.monotonic()
+
+    def _circuit_open(self) -> bool:
+        """Whether recent failures mean operations should fail fast instead of retrying."""
+        return (
+            self._consecutive_failures >= self._max_failures
+            and time.monotonic() - self._circuit_opened_at < self._circuit_cooldown
+        )
+
     async def close(self) -> None:
         """Close Redis connections gracefully."""
         if self._client:
@@ -153,6 +166,9 @@ class RedisManager:
 
     async def execute_with_retry(self, operation, *args, max_retries: int = 3, **kwargs) -> Any:
         """Execute Redis operation with retry logic."""
+        if self._circuit_open():
+            raise redis.ConnectionError("Redis circuit breaker is open")
+
         last_exception = None
 
         for attempt in range(max_retries + 1):
@@ -161,10 +177,15 @@ class RedisManager:
                     return await operation(client, *args, **kwargs)
             except (redis.ConnectionError, redis.TimeoutError) as e:
                 last_exception = e
+                self._record_failure()
+                if self._circuit_open():
+                    logger.error(f"Redis circuit breaker opened after {attempt + 1} attempts")
+                    break
                 if attempt < max_retries:
-                    wait_time = (2**attempt) * 0.5  # Exponential backoff
+                    # Exponential backoff with jitter so failing callers don't retry in lockstep
+                    wait_time = (2**attempt) * 0.5 * (0.5 + random.random() * 0.5)
                     logger.warning(
-                        f"Redis operation failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}"
+                        f"Redis operation failed (attempt {attempt + 1}), retrying in {wait_time:.2f}s: {e}"
                     )
                     await asyncio.sleep(wait_time)
                 else:
@@ -201,7 +222,15 @@ async def get_redis_info() -> dict:
         if client is None:
             return {"connected": False, "error": "Redis client not available"}
 
-        info = await client.info()
+        # One round trip for the liveness ping and only the INFO sections reported below
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.ping()
+            pipe.info("server")
+            pipe.info("clients")
+            pipe.info("memory")
+            _, server, clients, memory = await pipe.execute()
+
+        info = {**server, **clients, **memory}
         return {
             "connected": True,
             "version": info.get("redis_version"),
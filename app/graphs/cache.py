@@ -0,0 +1,163 @@
+"""Semantic response cache for the shopping graph.
+
+Answers are looked up in two tiers: an exact match on the normalized question, then a cosine
+similarity search over the embeddings of previously answered questions. A hit skips the whole
+graph, i.e. the intent classification, the retrieval round trip and the answer generation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.utils.logger import get_logger
+
+logger = get_logger("graphs.cache")
+
+# Upper bound on the extra latency a slow embedding backend can add to a cache lookup
+_EMBED_TIMEOUT_SECONDS = 2.0
+
+
+class SemanticCache:
+    """Bounded LRU cache of graph results matched exactly or by question similarity.
+
+    Question embeddings are kept L2-normalized in one preallocated matrix, so a similarity lookup
+    is a single matrix-vector product over the occupied rows. With `ttl` set, entries older than
+    `ttl` seconds are treated as misses and dropped.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings | None,
+        maxsize: int = 4096,
+        threshold: float = 0.92,
+        ttl: float | None = None,
+    ):
+        self._embeddings = embeddings
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl = ttl
+        # key -> (matrix row or None, cached result, expiry on the monotonic clock or None)
+        self._entries: OrderedDict[bytes, tuple[int | None, dict[str, Any], float | None]] = (
+            OrderedDict()
+        )
+        self._matrix: np.ndarray | None = None
+        self._row_keys: list[bytes | None] = []
+        self._free_rows: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+        self._matrix = None
+        self._row_keys = []
+        self._free_rows = []
+
+    @staticmethod
+    def _key(question: str) -> bytes:
+        normalized = " ".join(question.lower().split())
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+
+    async def _embed(self, question: str) -> np.ndarray | None:
+        """Return the normalized question embedding, or None if it can't be computed."""
+        if self._embeddings is None:
+            return None
+
+        try:
+            raw = await asyncio.wait_for(
+                self._embeddings.aembed_query(question), timeout=_EMBED_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            logger.debug("Semantic cache embedding failed: %s", e)
+            return None
+
+        vector = np.asarray(raw, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    async def lookup(self, question: str) -> tuple[dict[str, Any] | None, np.ndarray | None]:
+        """Find a cached result for `question`.
+
+        Returns the cached result (or None on a miss) together with the question embedding, which
+        callers pass back to `store` so a miss is embedded only once.
+        """
+        key = self._key(question)
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(key, entry):
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry[1], None
+
+        vector = await self._embed(question)
+        if vector is None or self._matrix is None or vector.shape[0] != self._matrix.shape[1]:
+            return None, vector
+
+        occupied = len(self._row_keys)
+        scores = self._matrix[:occupied] @ vector
+        best = int(np.argmax(scores))
+        best_key = self._row_keys[best]
+        if best_key is None or scores[best] < self.threshold:
+            return None, vector
+
+        entry = self._entries[best_key]
+        if self._expired(best_key, entry):
+            return None, vector
+
+        self._entries.move_to_end(best_key)
+        return entry[1], vector
+
+    def store(self, question: str, result: dict[str, Any], vector: np.ndarray | None) -> None:
+        """Cache `result` for `question`, evicting the least recently used entries beyond maxsize."""
+        key = self._key(question)
+        entry = self._entries.get(key)
+        if entry is not None and not self._expired(key, entry):
+            self._entries.move_to_end(key)
+            return
+
+        while len(self._entries) >= self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+        row = self._allocate_row(key, vector) if vector is not None else None
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (row, result, expires_at)
+
+    def _expired(self, key: bytes, entry: tuple[int | None, dict[str, Any], float | None]) -> bool:
+        """Drop `entry` and report True if its TTL has passed."""
+        expires_at = entry[2]
+        if expires_at is None or time.monotonic() < expires_at:
+            return False
+        self._discard(key)
+        return True
+
+    def _discard(self, key: bytes) -> None:
+        row, _, _ = self._entries.pop(key)
+        if row is not None:
+            self._matrix[row] = 0.0
+            self._row_keys[row] = None
+            self._free_rows.append(row)
+
+    def _allocate_row(self, key: bytes, vector: np.ndarray) -> int | None:
+        if self._matrix is None:
+            self._matrix = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            # Embedding model changed dimension; keep the entry as an exact-match one only
+            return None
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._row_keys[row] = key
+        else:
+            row = len(self._row_keys)
+            self._row_keys.append(key)
+
+        self._matrix[row] = vector
+        return row
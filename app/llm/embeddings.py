@@ -0,0 +1,77 @@
+"""Embedding clients shared by the retriever and the response cache."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from langchain_ollama import OllamaEmbeddings
+from pydantic import PrivateAttr
+
+
+class CachedOllamaEmbeddings(OllamaEmbeddings):
+    """OllamaEmbeddings with an in-process LRU cache of query vectors.
+
+    Queries are keyed on their stripped, lower-cased text, so repeated questions skip the HTTP
+    round trip to the Ollama daemon. Document embeddings (used when indexing) are not cached.
+    """
+
+    cache_maxsize: int = 8192
+
+    _cache: OrderedDict[str, list[float]] = PrivateAttr(default_factory=OrderedDict)
+    _cache_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return text.strip().lower()
+
+    def _cached(self, key: str) -> list[float] | None:
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+            return vector
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_maxsize:
+                self._cache.popitem(last=False)
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed query text, reusing the cached vector for a repeated query."""
+        key = self._cache_key(text)
+        vector = self._cached(key)
+        if vector is None:
+            vector = super().embed_query(text)
+            self._remember(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> list[float]:
+        """Embed query text, reusing the cached vector for a repeated query."""
+        key = self._cache_key(text)
+        vector = self._cached(key)
+        if vector is None:
+            vector = await super().aembed_query(text)
+            self._remember(key, vector)
+        return vector
+
+    async def aembed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Embed several queries, sending only the cache misses to Ollama in one request."""
+        keys = [self._cache_key(text) for text in texts]
+        vectors = [self._cached(key) for key in keys]
+
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        if misses:
+            fresh = await self.aembed_documents([texts[i] for i in misses])
+            for i, vector in zip(misses, fresh, strict=True):
+                vectors[i] = vector
+                self._remember(keys[i], vector)
+
+        return vectors
+
+    def clear_cache(self) -> None:
+        """Drop all cached query vectors."""
+        with self._cache_lock:
+            self._cache.clear()
@@ -3,6 +3,7 @@ import logging
 import os
 from collections.abc import AsyncIterator
 
+from groq import APITimeoutError
 from langchain_groq import ChatGroq  # Groq exposes OpenAI-compatible API
 
 from app.config import settings
@@ -37,18 +38,10 @@ class GroqClient(BaseLLMClient):
         timeout = kwargs.pop("timeout", settings.llm_timeout_seconds)
 
         try:
-            response = asyncio.wait_for(self.llm.ainvoke(prompt, **kwargs), timeout=timeout)
-            # Run in event loop if available, otherwise create new one
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If we're in an async context, this shouldn't be called
-                    raise RuntimeError("Use agenerate in async context")
-                result = loop.run_until_complete(response)
-            except RuntimeError:
-                result = asyncio.run(response)
-            return result.content
-        except TimeoutError:
+            # Blocking call with the timeout enforced by the Groq SDK; never touches an event loop
+            response = self.llm.invoke(prompt, timeout=timeout, **kwargs)
+            return response.content
+        except APITimeoutError:
             raise TimeoutError(f"LLM request timed out after {timeout} seconds") from None
 
     async def agenerate(self, prompt: str, **kwargs) -> str:
@@ -66,16 +59,9 @@ class GroqClient(BaseLLMClient):
         timeout = kwargs.pop("timeout", settings.llm_timeout_seconds)
 
         try:
-            response = asyncio.wait_for(self.llm.ainvoke(messages, **kwargs), timeout=timeout)
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    raise RuntimeError("Use achat in async context")
-                result = loop.run_until_complete(response)
-            except RuntimeError:
-                result = asyncio.run(response)
-            return result.content
-        except TimeoutError:
+            response = self.llm.invoke(messages, timeout=timeout, **kwargs)
+            return response.content
+        except APITimeoutError:
             raise TimeoutError(f"LLM request timed out after {timeout} seconds") from None
 
     async def achat(self, messages: list[dict[str, str]], **kwargs) -> str:
@@ -0,0 +1,31 @@
+"""CORS middleware that leaves probe traffic untouched."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
+
+
+class PathExcludingCORSMiddleware(CORSMiddleware):
+    """`CORSMiddleware` that passes requests under the excluded path prefixes straight through.
+
+    Health probes come from load balancers and orchestrators rather than browsers, so they never
+    need CORS headers.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: list[str] | None = None, **kwargs: Any):
+        super().__init__(app, **kwargs)
+        # A tuple lets str.startswith test every excluded prefix in a single call
+        self.exclude_paths = tuple(exclude_paths or ())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
@@ -12,7 +12,7 @@ from typing import Any
 
 from fastapi import Request
 from fastapi import Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.database.redis_client import execute_redis_operation
@@ -72,49 +72,50 @@ class RateLimiter:
         user_agent = request.headers.get("User-Agent", "unknown")[:50]  # Truncate
         return f"rate_limit:{client_ip}:{hash(user_agent) % 10000}"
 
-    async def _sliding_window_check(
-        self, redis_key: str, window_seconds: int, max_requests: int
-    ) -> tuple[bool, int, int]:
-        """Check rate limit using sliding window algorithm.
+    async def _sliding_window_checks(
+        self, windows: list[tuple[str, int, int]]
+    ) -> list[tuple[bool, int, int]]:
+        """Check several limits using the sliding window algorithm in one Redis round trip.
+
+        Args:
+            windows: (redis_key, window_seconds, max_requests) for each limit
 
         Returns:
-            (is_allowed, current_count, time_until_reset)
+            (is_allowed, current_count, time_until_reset) for each limit, in the same order
         """
 
-        async def _window_operation(client, key: str, window: int, max_req: int):
+        async def _window_operation(client, windows: list[tuple[str, int, int]]):
             current_time = time.time()
-            window_start = current_time - window
 
             pipe = client.pipeline()
+            for key, window, _ in windows:
+                # Remove expired entries
+                pipe.zremrangebyscore(key, 0, current_time - window)
 
-            # Remove expired entries
-            pipe.zremrangebyscore(key, 0, window_start)
-
-            # Count current requests in window
-            pipe.zcard(key)
+                # Count current requests in window
+                pipe.zcard(key)
 
-            # Add current request
-            pipe.zadd(key, {str(current_time): current_time})
+                # Add current request
+                pipe.zadd(key, {str(current_time): current_time})
 
-            # Set expiration
-            pipe.expire(key, window + 1)
+                # Set expiration
+                pipe.expire(key, window + 1)
 
             results = await pipe.execute()
-            current_count = results[1]  # Count after cleanup
-
-            is_allowed = current_count < max_req
-            time_until_reset = int(window - (current_time % window))
 
-            return is_allowed, current_count + 1, time_until_reset
+            checks = []
+            for i, (_, window, max_req) in enumerate(windows):
+                current_count = results[i * 4 + 1]  # Count after cleanup
+                time_until_reset = int(window - (current_time % window))
+                checks.append((current_count < max_req, current_count + 1, time_until_reset))
+            return checks
 
         try:
-            return await execute_redis_operation(
-                _window_operation, redis_key, window_seconds, max_requests
-            )
+            return await execute_redis_operation(_window_operation, windows)
         except Exception as e:
             logger.debug(f"Rate limiting check failed (Redis unavailable): {e}")
             # Fail open - allow request if Redis is down
-            return True, 0, 0
+            return [(True, 0, 0)] * len(windows)
 
     async def check_rate_limit(self, request: Request) -> tuple[bool, dict[str, Any]]:
         """Check if request should be rate limited.
@@ -124,22 +125,17 @@ class RateLimiter:
         """
         client_id = await self._get_client_identifier(request)
 
-        # Check minute window
-        minute_key = f"{client_id}:minute"
-        minute_allowed, minute_count, minute_reset = await self._sliding_window_check(
-            minute_key, 60, self.config.requests_per_minute
-        )
-
-        # Check hour window
-        hour_key = f"{client_id}:hour"
-        hour_allowed, hour_count, hour_reset = await self._sliding_window_check(
-            hour_key, 3600, self.config.requests_per_hour
-        )
-
-        # Check burst protection (last 10 seconds)
-        burst_key = f"{client_id}:burst"
-        burst_allowed, burst_count, _ = await self._sliding_window_check(
-            burst_key, 10, self.config.burst_size
+        # Check the minute, hour and burst (last 10 seconds) windows together
+        (
+            (minute_allowed, minute_count, minute_reset),
+            (hour_allowed, hour_count, hour_reset),
+            (burst_allowed, burst_count, _),
+        ) = await self._sliding_window_checks(
+            [
+                (f"{client_id}:minute", 60, self.config.requests_per_minute),
+                (f"{client_id}:hour", 3600, self.config.requests_per_hour),
+                (f"{client_id}:burst", 10, self.config.burst_size),
+            ]
         )
 
         is_allowed = minute_allowed and hour_allowed and burst_allowed
@@ -170,6 +166,10 @@ class RateLimiter:
         return is_allowed, rate_limit_info
 
 
+# Health checks are always exempt; str.startswith tests the whole tuple in one call
+_EXEMPT_PATH_PREFIXES = ("/health", "/docs", "/redoc", "/openapi.json")
+
+
 class RateLimitingMiddleware(BaseHTTPMiddleware):
     """FastAPI middleware for rate limiting."""
 
@@ -193,13 +193,7 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
 
     def _is_exempt_path(self, path: str) -> bool:
         """Check if path is exempt from rate limiting."""
-        # Always exempt health checks
-        if path.startswith("/health"):
-            return True
-
-        # Check other exempt paths
-        exempt_paths = ["/docs", "/redoc", "/openapi.json"]
-        return any(path.startswith(exempt) for exempt in exempt_paths)
+        return path.startswith(_EXEMPT_PATH_PREFIXES)
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with rate limiting."""
@@ -217,6 +211,7 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
         rate_limiter = self.rate_limiters[endpoint_type]
 
         # Check rate limit
+        rate_info = None
         try:
             is_allowed, rate_info = await rate_limiter.check_rate_limit(request)
 
@@ -243,9 +238,9 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
                     },
                 )
 
-                response = JSONResponse(
+                response = ORJSONResponse(
                     status_code=429,
-                    content=error_response.dict(),
+                    content=error_response.model_dump(mode="json"),
                     headers={
                         "X-RateLimit-Limit-Minute": str(rate_info["minute_limit"]),
                         "X-RateLimit-Remaining-Minute": str(rate_info["minute_remaining"]),
@@ -265,14 +260,12 @@ class RateLimitingMiddleware(BaseHTTPMiddleware):
         # Process request normally
         response = await call_next(request)
 
-        # Add rate limit headers to successful responses
-        try:
-            _, rate_info = await rate_limiter.check_rate_limit(request)
+        # Add rate limit headers to successful responses, reusing the check made above so the
+        # request isn't recorded against the limits a second time
+        if rate_info is not None:
             response.headers["X-RateLimit-Limit-Minute"] = str(rate_info["minute_limit"])
             response.headers["X-RateLimit-Remaining-Minute"] = str(rate_info["minute_remaining"])
             response.headers["X-RateLimit-Limit-Hour"] = str(rate_info["hour_limit"])
             response.headers["X-RateLimit-Remaining-Hour"] = str(rate_info["hour_remaining"])
-        except Exception:
-            pass  # Don't fail the response if we can't add headers
 
         return response
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Any
-
 from fastapi import Request
-from fastapi import Response
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp
+from starlette.types import Message
+from starlette.types import Receive
+from starlette.types import Scope
+from starlette.types import Send
 
 from app.utils.errors import Error
 from app.utils.errors import ErrorCode
@@ -16,12 +17,16 @@ from app.utils.logger import get_logger
 logger = get_logger("middleware.request_size")
 
 
-class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to limit request body size and prevent DoS attacks."""
+class RequestSizeLimitMiddleware:
+    """Middleware to limit request body size and prevent DoS attacks.
+
+    Implemented as plain ASGI rather than on `BaseHTTPMiddleware`, so requests that pass the check
+    go straight to the app without an extra task and memory stream per request.
+    """
 
     def __init__(
         self,
-        app: Any,
+        app: ASGIApp,
         max_size_bytes: int = 10 * 1024 * 1024,  # 10MB default
         exclude_paths: list[str] | None = None,
     ):
@@ -32,25 +37,27 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
             max_size_bytes: Maximum allowed request body size in bytes
             exclude_paths: List of paths to exclude from size checking
         """
-        super().__init__(app)
+        self.app = app
         self.max_size_bytes = max_size_bytes
-        self.exclude_paths = exclude_paths or []
+        # A tuple lets str.startswith test every excluded prefix in a single call
+        self.exclude_paths = tuple(exclude_paths or ())
         logger.info(
             f"Request size limit middleware initialized with max size: {max_size_bytes} bytes"
         )
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and enforce size limits."""
-
-        # Skip size checking for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-
-        # Skip for GET requests (no body expected)
-        if request.method == "GET":
-            return await call_next(request)
+        # Skip non-HTTP traffic, GET requests (no body expected) and excluded paths
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "GET"
+            or scope["path"].startswith(self.exclude_paths)
+        ):
+            await self.app(scope, receive, send)
+            return
 
         # Check Content-Length header first (most efficient)
+        request = Request(scope)
         content_length = request.headers.get("content-length")
         if content_length:
             try:
@@ -66,25 +73,37 @@ class RequestSizeLimitMiddleware(BaseHTTPMiddleware):
                             "client_ip": request.client.host if request.client else "unknown",
                         },
                     )
-                    return self._create_error_response(
+                    response = self._create_error_response(
                         f"Request body too large. Maximum size: {self.max_size_bytes} bytes"
                     )
+                    await response(scope, receive, send)
+                    return
             except ValueError:
                 logger.warning(f"Invalid Content-Length header: {content_length}")
 
         # For requests without Content-Length, we'll let them through
         # Most legitimate requests will have Content-Length header
         # This avoids the complexity of request reconstruction
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             logger.error(f"Error processing request: {e}")
-            return self._create_error_response("Error processing request")
+            if response_started:
+                raise
+            await self._create_error_response("Error processing request")(scope, receive, send)
 
-    def _create_error_response(self, message: str) -> JSONResponse:
+    def _create_error_response(self, message: str) -> ORJSONResponse:
         """Create standardized error response for size limit violations."""
         error = Error(ErrorCode.REQUEST_TOO_LARGE, message=message)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=413,  # HTTP 413 Payload Too Large
             content={
                 "error": {
@@ -2,14 +2,18 @@ from typing import Any
 
 from pydantic import BaseModel
 from pydantic import Field
+from pydantic import TypeAdapter
+from pydantic import ValidationError
 from pydantic import field_validator
 
 
 class QueryPayload(BaseModel):
     """Payload for the shopping query endpoint."""
 
-    q: str = Field(..., title="Question", description="The user's shopping question")
-    sessionId: str = Field(..., title="Session ID", description="The user's session ID")
+    q: str = Field(..., min_length=1, title="Question", description="The user's shopping question")
+    sessionId: str = Field(
+        ..., min_length=1, title="Session ID", description="The user's session ID"
+    )
     # context: list[str] = Field(..., title="Context", description="The context for the query")
 
 
@@ -70,6 +74,34 @@ class DocumentsPayload(BaseModel):
         return v
 
 
+# Built once at import; pydantic-core dispatches wrapped vs. bare document lists itself
+_FLEXIBLE_DOCUMENTS_ADAPTER = TypeAdapter(DocumentsPayload | list[DocumentPayload])
+
+
+def _describe_flexible_error(error: ValidationError) -> str:
+    """Describe the validation failure of the union branch matching the payload's shape."""
+    # Errors with a one-element location only say the payload was not of that branch's type
+    errors = [err for err in error.errors() if len(err["loc"]) > 1]
+    if not errors:
+        return "Expected a JSON array or an object with a 'documents' field"
+
+    first = errors[0]
+    loc = first["loc"][1:]
+    if loc == ("documents",):
+        if first["type"] == "missing":
+            return "Expected a JSON array or an object with a 'documents' field"
+        if first["type"] == "list_type":
+            return "'documents' must be a list"
+        return "Documents list cannot be empty"
+
+    if loc[0] == "documents":
+        loc = loc[1:]
+    index, field = loc[0], ".".join(str(part) for part in loc[1:])
+    if field:
+        return f"Invalid document at index {index}: {field}: {first['msg']}"
+    return f"Invalid document at index {index}: {first['msg']}"
+
+
 class BulkDocumentPayload(BaseModel):
     """Flexible payload that accepts either wrapped or unwrapped document lists."""
 
@@ -81,40 +113,20 @@ class BulkDocumentPayload(BaseModel):
         - {"documents": [...]} - wrapped format
         - [...] - direct array format
         """
-        if isinstance(payload, dict) and "documents" in payload:
-            # Wrapped format: {"documents": [...]}
-            docs_data = payload["documents"]
-        elif isinstance(payload, list):
-            # Direct array format: [...]
-            docs_data = payload
-        else:
-            raise ValueError("Expected a JSON array or an object with a 'documents' field")
-
-        if not isinstance(docs_data, list):
-            raise ValueError("'documents' must be a list")
-
-        if not docs_data:
+        try:
+            parsed = _FLEXIBLE_DOCUMENTS_ADAPTER.validate_python(payload)
+        except ValidationError as e:
+            raise ValueError(_describe_flexible_error(e)) from None
+
+        documents = parsed if isinstance(parsed, list) else parsed.documents
+        if not documents:
             raise ValueError("Documents list cannot be empty")
 
-        # Parse each document
-        documents = []
-        for i, doc_data in enumerate(docs_data):
-            try:
-                if isinstance(doc_data, dict):
-                    doc = DocumentPayload(**doc_data)
-                # Try to convert to dict if it has dict() method
-                elif hasattr(doc_data, "dict"):
-                    doc = DocumentPayload(**doc_data.dict())
-                else:
-                    raise ValueError(f"Document {i} must be a JSON object")
-
-                # Validate that document has content
-                if not doc.has_content():
-                    raise ValueError(f"Document {i} (id: {doc.id}) has no text content")
-
-                documents.append(doc)
-
-            except Exception as e:
-                raise ValueError(f"Invalid document at index {i}: {e!s}")
+        # Validate that each document has content
+        for i, doc in enumerate(documents):
+            if not doc.has_content():
+                raise ValueError(
+                    f"Invalid document at index {i}: Document {i} (id: {doc.id}) has no text content"
+                )
 
         return documents
@@ -112,7 +112,8 @@ greeting_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-# Sales prompt for purchase-focused interactions
+# Sales prompt for purchase-focused interactions. Here and in the product inquiry prompt the
+# context comes last, so the static instructions form a prefix the provider can cache.
 sales_prompt = ChatPromptTemplate.from_messages(
     [
         (
@@ -141,9 +142,6 @@ sales_prompt = ChatPromptTemplate.from_messages(
             4. Create excitement about the products
             5. Include a clear call-to-action
 
-            **Available Product Information:**
-            {context}
-
             **Examples of Great Sales Language:**
             - "This is one of our absolute best sellers!"
             - "Our customers rave about this product"
@@ -152,7 +150,10 @@ sales_prompt = ChatPromptTemplate.from_messages(
             - "Limited time special offer"
             - "I'd love to help you get this ordered today"
 
-            Remember: You're here to help them find products they'll genuinely love while building excitement about their purchase!""",
+            Remember: You're here to help them find products they'll genuinely love while building excitement about their purchase!
+
+            **Available Product Information:**
+            {context}""",
         ),
         (
             "human",
@@ -185,9 +186,6 @@ product_inquiry_prompt = ChatPromptTemplate.from_messages(
             - Mention what makes the products special or unique
             - Be honest about any limitations while staying positive
 
-            **Available Product Information:**
-            {context}
-
             **Response Guidelines:**
             - Start with the key information they're looking for
             - Add helpful details and benefits
@@ -195,7 +193,10 @@ product_inquiry_prompt = ChatPromptTemplate.from_messages(
             - End with a friendly invitation to purchase or ask more questions
             - Keep the tone informative but sales-friendly
 
-            Focus on being genuinely helpful while showcasing why our products are great choices!""",
+            Focus on being genuinely helpful while showcasing why our products are great choices!
+
+            **Available Product Information:**
+            {context}""",
         ),
         (
             "human",
@@ -0,0 +1,125 @@
+"""Micro-batching of retriever searches issued by concurrent requests.
+
+Searches that arrive within a few milliseconds of each other are collected into one batch: the
+questions are embedded with a single embedding call and the vector searches then run back to back
+on one worker thread, instead of every request paying for its own embedding round trip and thread
+hop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.embeddings import Embeddings
+
+from app.utils.logger import get_logger
+
+logger = get_logger("retrievers.batcher")
+
+
+@dataclass
+class _PendingSearch:
+    retriever: Any
+    question: str
+    k: int
+    future: asyncio.Future
+
+
+class SearchBatcher:
+    """Coalesce concurrent `similarity_search` calls into batches.
+
+    A batch is flushed when it reaches `max_batch_size` searches or `max_wait_seconds` after its
+    first search arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings | None,
+        max_batch_size: int = 32,
+        max_wait_seconds: float = 0.008,
+    ):
+        self._embeddings = embeddings
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: list[_PendingSearch] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        # Strong references so in-flight batches aren't garbage collected
+        self._running: set[asyncio.Task] = set()
+
+    async def search(
+        self, retriever: Any, question: str, k: int
+    ) -> tuple[list[Any], list[float] | None]:
+        """Search `retriever` for `question` as part of the next batch.
+
+        Returns the documents, each carrying its embedding in `metadata["vector"]` when the
+        retriever supports it, together with the question embedding (None if it couldn't be
+        computed, in which case the retriever embeds the question itself).
+        """
+        loop = asyncio.get_running_loop()
+        pending = _PendingSearch(retriever, question, k, loop.create_future())
+        self._pending.append(pending)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_seconds, self._flush)
+
+        return await pending.future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _embed(self, questions: list[str]) -> list[list[float] | None]:
+        if self._embeddings is not None:
+            # Prefer the cache-aware batch call, which only embeds questions it hasn't seen
+            embed_batch = getattr(self._embeddings, "aembed_queries", None)
+            try:
+                if embed_batch is not None:
+                    return await embed_batch(questions)
+                return await self._embeddings.aembed_documents(questions)
+            except Exception as e:
+                logger.debug("Batch embedding failed, searching without vectors: %s", e)
+        return [None] * len(questions)
+
+    @staticmethod
+    def _search_all(
+        batch: list[_PendingSearch], vectors: list[list[float] | None]
+    ) -> list[list[Any] | Exception]:
+        results: list[list[Any] | Exception] = []
+        for pending, vector in zip(batch, vectors, strict=True):
+            kwargs = {"vector": vector, "include_vector": True} if vector is not None else {}
+            try:
+                results.append(
+                    pending.retriever.similarity_search(pending.question, k=pending.k, **kwargs)
+                )
+            except Exception as e:
+                results.append(e)
+        return results
+
+    async def _run_batch(self, batch: list[_PendingSearch]) -> None:
+        try:
+            vectors = await self._embed([pending.question for pending in batch])
+            results = await asyncio.to_thread(self._search_all, batch, vectors)
+        except Exception as e:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for pending, vector, result in zip(batch, vectors, results, strict=True):
+            if pending.future.done():
+                continue
+            if isinstance(result, Exception):
+                pending.future.set_exception(result)
+            else:
+                pending.future.set_result((result, vector))
@@ -176,14 +176,14 @@ class WeaviateRetriever(BaseRetriever):
             list(documents), self._add_batch, f"Adding documents to Weaviate '{self.index_name}'"
         )
 
-    def _search(self, query, k):
+    def _search(self, query, k, **kwargs):
         """Internal search method with connection health check."""
         # Ensure connection is healthy before searching
         self._ensure_connection()
 
         with self._lock:
             try:
-                results = self.vectorstore.similarity_search(query, k=k)
+                results = self.vectorstore.similarity_search(query, k=k, **kwargs)
                 logger.debug(f"Search returned {len(results)} results")
                 return results
             except Exception as e:
@@ -197,12 +197,14 @@ class WeaviateRetriever(BaseRetriever):
         """Return up to k most similar documents for the query.
 
         If `query` is text, an `embedding_fn` must be provided or an embedding provider should
-        be used externally to produce the vector.
+        be used externally to produce the vector. Extra keyword arguments are passed through to the
+        vector store, e.g. `vector=` to reuse a precomputed query embedding or `include_vector=True`
+        to get each document's embedding back in its metadata.
         """
         if k <= 0:
             return []
 
-        return self._retry_on_failure(self._search, query, k)
+        return self._retry_on_failure(self._search, query, k, **kwargs)
 
     def get(self, doc_id: str) -> dict[str, Any] | None:
         def _get():
@@ -9,6 +9,7 @@ Implements a production-ready RAG pipeline with:
 
 from __future__ import annotations
 
+import threading
 from typing import Any
 
 from langchain_core.documents import Document
@@ -32,9 +33,35 @@ class RAGService:
 
     def __init__(self):
         self.embeddings = OllamaEmbeddings(model="nomic-embed-text")
-        self.llm_client = GroqClient()
-        self.retriever = None
-        self._initialize_retriever()
+        # The Groq client and the Weaviate connection are created on first use, not at import
+        self._llm_client: GroqClient | None = None
+        self._retriever: WeaviateRetriever | None = None
+        self._retriever_initialized = False
+        self._retriever_lock = threading.Lock()
+
+    @property
+    def llm_client(self) -> GroqClient:
+        if self._llm_client is None:
+            self._llm_client = GroqClient()
+        return self._llm_client
+
+    @llm_client.setter
+    def llm_client(self, llm_client: GroqClient) -> None:
+        self._llm_client = llm_client
+
+    @property
+    def retriever(self) -> WeaviateRetriever | None:
+        """The FAQ retriever, connected on first access; None if initialization failed."""
+        if not self._retriever_initialized:
+            with self._retriever_lock:
+                if not self._retriever_initialized:
+                    self._initialize_retriever()
+        return self._retriever
+
+    @retriever.setter
+    def retriever(self, retriever: WeaviateRetriever | None) -> None:
+        self._retriever = retriever
+        self._retriever_initialized = True
 
     def _initialize_retriever(self) -> None:
         """Initialize retriever with error handling."""
@@ -38,19 +38,24 @@ class SessionService:
         """Generate Redis key for session data."""
         return f"session:{session_id}:{key_type}"
     
+    def _new_session_data(self, user_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build the initial session info record."""
+        now = datetime.now(timezone.utc).isoformat()
+        return {
+            "created_at": now,
+            "last_active": now,
+            "user_data": user_data or {},
+            "conversation_count": 0,
+            "preferences": {},
+            "shopping_cart": []
+        }
+    
     async def create_session(self, session_id: str, user_data: Optional[Dict[str, Any]] = None) -> bool:
         """Create a new user session."""
         try:
             redis_client = await self._get_redis_client()
             session_key = await self._get_session_key(session_id, "info")
-            session_data = {
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "last_active": datetime.now(timezone.utc).isoformat(),
-                "user_data": user_data or {},
-                "conversation_count": 0,
-                "preferences": {},
-                "shopping_cart": []
-            }
+            session_data = self._new_session_data(user_data)
             
             await redis_client.setex(
                 session_key, 
@@ -58,11 +63,11 @@ class SessionService:
                 json.dumps(session_data)
             )
             
-            logger.info(f"Created new session: {session_id}")
+            logger.info("Created new session: %s", session_id)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to create session {session_id}: {e}")
+            logger.error("Failed to create session %s: %s", session_id, e)
             return False
     
     async def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
@@ -82,7 +87,7 @@ class SessionService:
             return None
             
         except Exception as e:
-            logger.error(f"Failed to get session info for {session_id}: {e}")
+            logger.error("Failed to get session info for %s: %s", session_id, e)
             return None
     
     async def add_conversation_message(self, session_id: str, role: str, content: str) -> bool:
@@ -110,7 +115,45 @@ class SessionService:
             return True
             
         except Exception as e:
-            logger.error(f"Failed to add conversation message for {session_id}: {e}")
+            logger.error("Failed to add conversation message for %s: %s", session_id, e)
+            return False
+    
+    async def touch_and_append(self, session_id: str, role: str, content: str) -> bool:
+        """Ensure a session exists, refresh it and append a conversation message.
+
+        Equivalent to `get_session_info` + `create_session` + `add_conversation_message`, but uses
+        one read and one pipelined write instead of a Redis round-trip per command.
+        """
+        try:
+            redis_client = await self._get_redis_client()
+            session_key = await self._get_session_key(session_id, "info")
+            conv_key = await self._get_session_key(session_id, "conversation")
+
+            data = await redis_client.get(session_key)
+            if data:
+                session_data = json.loads(data)
+                session_data["last_active"] = datetime.now(timezone.utc).isoformat()
+            else:
+                session_data = self._new_session_data()
+                logger.info("Created new session: %s", session_id)
+            session_data["conversation_count"] += 1
+
+            message = {
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            }
+
+            async with redis_client.pipeline(transaction=True) as pipe:
+                pipe.setex(session_key, self.session_ttl, json.dumps(session_data))
+                pipe.lpush(conv_key, json.dumps(message))
+                pipe.expire(conv_key, self.conversation_ttl)
+                await pipe.execute()
+
+            return True
+
+        except Exception as e:
+            logger.error("Failed to update session %s: %s", session_id, e)
             return False
     
     async def get_conversation_history(self, session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -130,7 +173,7 @@ class SessionService:
             return conversation
             
         except Exception as e:
-            logger.error(f"Failed to get conversation history for {session_id}: {e}")
+            logger.error("Failed to get conversation history for %s: %s", session_id, e)
             return []
     
     async def update_user_preferences(self, session_id: str, preferences: Dict[str, Any]) -> bool:
@@ -148,11 +191,11 @@ class SessionService:
             session_key = await self._get_session_key(session_id, "info")
             await redis_client.setex(session_key, self.session_ttl, json.dumps(session_data))
             
-            logger.info(f"Updated preferences for session {session_id}: {preferences}")
+            logger.info("Updated preferences for session %s: %s", session_id, preferences)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update preferences for {session_id}: {e}")
+            logger.error("Failed to update preferences for %s: %s", session_id, e)
             return False
     
     async def add_to_cart(self, session_id: str, item: Dict[str, Any]) -> bool:
@@ -171,11 +214,11 @@ class SessionService:
             session_key = await self._get_session_key(session_id, "info")
             await redis_client.setex(session_key, self.session_ttl, json.dumps(session_data))
             
-            logger.info(f"Added item to cart for session {session_id}: {item.get('name', 'Unknown')}")
+            logger.info("Added item to cart for session %s: %s", session_id, item.get("name", "Unknown"))
             return True
             
         except Exception as e:
-            logger.error(f"Failed to add item to cart for {session_id}: {e}")
+            logger.error("Failed to add item to cart for %s: %s", session_id, e)
             return False
     
     async def get_shopping_cart(self, session_id: str) -> List[Dict[str, Any]]:
@@ -185,7 +228,7 @@ class SessionService:
             return session_data.get("shopping_cart", []) if session_data else []
             
         except Exception as e:
-            logger.error(f"Failed to get shopping cart for {session_id}: {e}")
+            logger.error("Failed to get shopping cart for %s: %s", session_id, e)
             return []
     
     async def clear_cart(self, session_id: str) -> bool:
@@ -202,11 +245,11 @@ class SessionService:
             session_key = await self._get_session_key(session_id, "info")
             await redis_client.setex(session_key, self.session_ttl, json.dumps(session_data))
             
-            logger.info(f"Cleared cart for session {session_id}")
+            logger.info("Cleared cart for session %s", session_id)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to clear cart for {session_id}: {e}")
+            logger.error("Failed to clear cart for %s: %s", session_id, e)
             return False
     
     async def get_session_analytics(self, session_id: str) -> Dict[str, Any]:
@@ -246,7 +289,7 @@ class SessionService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to get analytics for {session_id}: {e}")
+            logger.error("Failed to get analytics for %s: %s", session_id, e)
             return {}
     
     def _calculate_session_duration(self, session_data: Dict[str, Any]) -> Optional[str]:
@@ -274,7 +317,7 @@ class SessionService:
             return 0
             
         except Exception as e:
-            logger.error(f"Failed to cleanup expired sessions: {e}")
+            logger.error("Failed to cleanup expired sessions: %s", e)
             return 0
 
 
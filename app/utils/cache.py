@@ -1,9 +1,17 @@
-"""Redis-backed cache helpers."""
+"""Redis-backed and in-process cache helpers."""
 
+import asyncio
 import hashlib
 import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Hashable
 from typing import Any
 
+import orjson
+
 from app.config import settings
 
 
@@ -41,7 +49,7 @@ async def get_cached_response(key: str) -> Any | None:
         raw = await client.get(key)
         if not raw:
             return None
-        return json.loads(raw)
+        return orjson.loads(raw)
     except Exception:
         # swallow cache errors to avoid failing requests
         return None
@@ -56,7 +64,7 @@ async def set_cached_response(key: str, value: Any, ttl: int | None = None) -> N
         if client is None:
             return
 
-        raw = json.dumps(value)
+        raw = orjson.dumps(value)
         await client.set(key, raw, ex=ttl or settings.cache_ttl_seconds)
     except Exception:
         # ignore cache errors
@@ -67,3 +75,85 @@ async def set_cached_response(key: str, value: Any, ttl: int | None = None) -> N
 async def cache_response(key: str, value: Any, ttl: int = 300) -> None:
     """Alias for set_cached_response with explicit TTL."""
     await set_cached_response(key, value, ttl)
+
+
+_MISSING = object()
+
+
+class AsyncTTLCache:
+    """Bounded in-process LRU cache with per-entry TTL for async producers.
+
+    Concurrent misses for the same key are coalesced: the first caller starts the producer and
+    every other caller awaits that same task instead of starting its own.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop all cached entries; in-flight producers are left running."""
+        self._entries.clear()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the live value cached for `key`, or `default` if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache `value` under `key`, evicting the least recently used entries beyond maxsize."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        store_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """Return the cached value for `key`, producing it with `factory` on a miss.
+
+        Results for which `store_if` returns False are handed to the waiting callers but not
+        cached. Exceptions are propagated to every waiter and never cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t, store_if))
+
+        # Shield so one cancelled caller does not abort the shared producer for the others
+        return await asyncio.shield(task)
+
+    def _on_done(
+        self, key: Hashable, task: asyncio.Task, store_if: Callable[[Any], bool] | None
+    ) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        value = task.result()
+        if store_if is not None and not store_if(value):
+            return
+
+        self.set(key, value)
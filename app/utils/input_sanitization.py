@@ -107,13 +107,41 @@ class InputSanitizer:
         # Maximum allowed repetition of characters
         self.max_char_repetition = 10
 
+        # Patterns for encoding bypass detection
+        self.encoding_patterns = [
+            r"\\x[0-9a-fA-F]{2}",  # Hex encoding
+            r"\\u[0-9a-fA-F]{4}",  # Unicode encoding
+            r"\\[0-7]{3}",  # Octal encoding
+            r"%[0-9a-fA-F]{2}",  # URL encoding
+        ]
+
+        self._compile_patterns()
+
+    def _compile_patterns(self) -> None:
+        """Compile all patterns once so each sanitization pass reuses them."""
+        self._injection_regexes = [
+            (pattern, re.compile(pattern)) for pattern in self.injection_patterns
+        ]
+        self._pii_regexes = [
+            (re.compile(pattern), f"[REDACTED_{pii_type}]", pii_type)
+            for pattern, pii_type in self.pii_patterns
+        ]
+        self._encoding_regexes = [
+            (pattern, re.compile(pattern)) for pattern in self.encoding_patterns
+        ]
+        self._dangerous_chars_table = str.maketrans(dict.fromkeys(self.dangerous_chars))
+        self._repetition_regex = re.compile(r"(.)\1{" + str(self.max_char_repetition) + r",}")
+        self._whitespace_regex = re.compile(r"\s+")
+        # Single-spaced ASCII words and basic punctuation: html escaping, control-char
+        # removal, whitespace normalization and encoding checks are all no-ops on it
+        self._plain_text_regex = re.compile(r"[A-Za-z0-9?.,\-]+(?: [A-Za-z0-9?.,\-]+)*\Z")
+
     def _detect_prompt_injection(self, text: str) -> list[str]:
         """Detect potential prompt injection attempts."""
         warnings = []
 
-        for pattern in self.injection_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
+        for pattern, regex in self._injection_regexes:
+            if regex.search(text):
                 warnings.append(f"Potential prompt injection detected: pattern '{pattern[:50]}...'")
                 logger.warning(f"Prompt injection pattern detected in input: {pattern[:100]}")
 
@@ -124,20 +152,18 @@ class InputSanitizer:
         redacted_text = text
         warnings = []
 
-        for pattern, pii_type in self.pii_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                warnings.append(f"PII detected: {pii_type}")
+        for regex, replacement, pii_type in self._pii_regexes:
+            match_count = sum(1 for _ in regex.finditer(text))
+            if match_count:
+                warnings.extend([f"PII detected: {pii_type}"] * match_count)
                 # Replace with redacted version
-                redacted_text = re.sub(pattern, f"[REDACTED_{pii_type}]", redacted_text)
+                redacted_text = regex.sub(replacement, redacted_text)
 
         return redacted_text, warnings
 
     def _remove_dangerous_chars(self, text: str) -> str:
         """Remove potentially dangerous control characters."""
-        for char in self.dangerous_chars:
-            text = text.replace(char, "")
-        return text
+        return text.translate(self._dangerous_chars_table)
 
     def _limit_repetition(self, text: str) -> str:
         """Limit excessive character repetition."""
@@ -147,13 +173,12 @@ class InputSanitizer:
             char = match.group(1)
             return char * min(len(match.group(0)), self.max_char_repetition)
 
-        pattern = r"(.)\1{" + str(self.max_char_repetition) + r",}"
-        return re.sub(pattern, replace_repetition, text)
+        return self._repetition_regex.sub(replace_repetition, text)
 
     def _normalize_whitespace(self, text: str) -> str:
         """Normalize whitespace to prevent formatting attacks."""
         # Replace multiple whitespace with single space
-        text = re.sub(r"\s+", " ", text)
+        text = self._whitespace_regex.sub(" ", text)
         return text.strip()
 
     def _check_length(self, text: str) -> tuple[str, list[str]]:
@@ -171,15 +196,8 @@ class InputSanitizer:
         warnings = []
 
         # Check for common encoding indicators
-        encoding_patterns = [
-            r"\\x[0-9a-fA-F]{2}",  # Hex encoding
-            r"\\u[0-9a-fA-F]{4}",  # Unicode encoding
-            r"\\[0-7]{3}",  # Octal encoding
-            r"%[0-9a-fA-F]{2}",  # URL encoding
-        ]
-
-        for pattern in encoding_patterns:
-            if re.search(pattern, text):
+        for pattern, regex in self._encoding_regexes:
+            if regex.search(text):
                 warnings.append(f"Potential encoding bypass detected: {pattern}")
 
         return warnings
@@ -208,15 +226,17 @@ class InputSanitizer:
         original_length = len(text)
         warnings = []
         removed_content = []
+        is_plain = original_length <= self.max_length and self._plain_text_regex.match(text)
 
-        # Step 1: Basic cleaning
-        text = html.escape(text)  # Escape HTML
-        text = self._remove_dangerous_chars(text)
-        text = self._normalize_whitespace(text)
+        if not is_plain:
+            # Step 1: Basic cleaning
+            text = html.escape(text)  # Escape HTML
+            text = self._remove_dangerous_chars(text)
+            text = self._normalize_whitespace(text)
 
-        # Step 2: Length check
-        text, length_warnings = self._check_length(text)
-        warnings.extend(length_warnings)
+            # Step 2: Length check
+            text, length_warnings = self._check_length(text)
+            warnings.extend(length_warnings)
 
         # Step 3: Character repetition limits
         text = self._limit_repetition(text)
@@ -230,8 +250,9 @@ class InputSanitizer:
         warnings.extend(injection_warnings)
 
         # Step 6: Encoding bypass detection
-        encoding_warnings = self._detect_encoding_attempts(text)
-        warnings.extend(encoding_warnings)
+        if not is_plain:
+            encoding_warnings = self._detect_encoding_attempts(text)
+            warnings.extend(encoding_warnings)
 
         # Determine if input is safe
         has_critical_issues = any(
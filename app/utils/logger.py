@@ -58,12 +58,13 @@ def setup_logging(
         root.setLevel(logging.CRITICAL + 10)
         return
 
-    os.makedirs(log_dir, exist_ok=True)
-
     root = logging.getLogger()
     if root.handlers:
+        # Already configured; repeated calls must not stack duplicate handlers
         return
 
+    os.makedirs(log_dir, exist_ok=True)
+
     formatter = JsonFormatter()
 
     # Console handler
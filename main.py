@@ -2,7 +2,14 @@ def main() -> None:
     """Run the FastAPI application via Uvicorn."""
     import uvicorn
 
-    uvicorn.run("app.app:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "app.app:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        loop="uvloop",
+        http="httptools",
+    )
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 """Unit tests for the API endpoints."""
 
+import asyncio
+from unittest.mock import AsyncMock
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.api.v1.routes import _coalesce_content_chunks
+from app.api.v1.routes import _prefetch_chunks
 from app.app import create_app
 from app.utils.errors import Error
 from app.utils.errors import ErrorCode
@@ -80,7 +84,7 @@ class TestShoppingEndpoints:
 
     def test_query_shopping_success(self, client):
         """Test successful shopping query."""
-        with patch("app.api.v1.shopping.run_shopping_graph") as mock_graph:
+        with patch("app.api.v1.routes.run_shopping_graph") as mock_graph:
             mock_graph.return_value = {
                 "intent": "FAQ",
                 "answer": "The product has advanced AI features.",
@@ -99,12 +103,24 @@ class TestShoppingEndpoints:
 
     def test_query_shopping_empty_question(self, client):
         """Test shopping query with empty question."""
-        response = client.post("/api/v1/shopping/query", json={"q": ""})
+        response = client.post("/api/v1/shopping/query", json={"q": "", "sessionId": "s1"})
+
+        assert response.status_code == 422  # Rejected by QueryPayload's min_length
+        data = response.json()
+        assert data["detail"][0]["loc"] == ["body", "q"]
+
+    def test_query_shopping_question_too_long(self, client):
+        """Test shopping query rejects oversized questions before sanitizing them."""
+        with patch("app.api.v1.routes.session_service.touch_and_append") as mock_touch:
+            response = client.post(
+                "/api/v1/shopping/query", json={"q": "a" * 5000, "sessionId": "s1"}
+            )
 
         assert response.status_code == 400
         data = response.json()
-        assert data["success"] is False
         assert data["error"]["code"] == "invalid_input"
+        assert data["error"]["details"]["length"] == 5000
+        mock_touch.assert_not_called()
 
     def test_query_shopping_missing_question(self, client):
         """Test shopping query with missing question field."""
@@ -114,7 +130,7 @@ class TestShoppingEndpoints:
 
     def test_add_documents_success(self, client, valid_document_payload):
         """Test successful document addition."""
-        with patch("app.api.v1.shopping.rag_add_documents") as mock_add:
+        with patch("app.api.v1.routes.rag_add_documents") as mock_add:
             mock_add.return_value = "Successfully added 2 documents to the knowledge base"
 
             response = client.post("/api/v1/shopping/add-documents", json=valid_document_payload)
@@ -132,7 +148,7 @@ class TestShoppingEndpoints:
             {"id": "doc2", "content": "Document 2 content", "title": "Document 2"},
         ]
 
-        with patch("app.api.v1.shopping.rag_add_documents") as mock_add:
+        with patch("app.api.v1.routes.rag_add_documents") as mock_add:
             mock_add.return_value = "Successfully added 2 documents"
 
             response = client.post("/api/v1/shopping/add-documents", json=documents)
@@ -174,7 +190,7 @@ class TestShoppingEndpoints:
 
     def test_add_documents_service_error(self, client, valid_document_payload):
         """Test document addition with service error."""
-        with patch("app.api.v1.shopping.rag_add_documents") as mock_add:
+        with patch("app.api.v1.routes.rag_add_documents") as mock_add:
             mock_add.side_effect = Exception("Database connection failed")
 
             response = client.post("/api/v1/shopping/add-documents", json=valid_document_payload)
@@ -191,7 +207,7 @@ class TestAPIErrorHandling:
     def test_api_error_handler(self, client):
         """Test custom API error handler."""
         # This would be triggered by our custom Error() calls
-        with patch("app.api.v1.shopping.run_shopping_graph") as mock_graph:
+        with patch("app.api.v1.routes.run_shopping_graph") as mock_graph:
             mock_graph.side_effect = Error(
                 ErrorCode.INVALID_INPUT, message="Test error message", details={"field": "test"}
             )
@@ -212,3 +228,113 @@ class TestAPIErrorHandling:
         assert response.status_code == 422  # Pydantic validation error
         data = response.json()
         assert "detail" in data  # FastAPI default validation error format
+
+
+class TestStreamCaching:
+    """Test replay of completed streams for repeated questions."""
+
+    def test_repeated_stream_query_is_replayed(self, client):
+        """A second identical streaming query is served from cache without rerunning the graph."""
+        calls = 0
+
+        async def fake_stream(question):
+            nonlocal calls
+            calls += 1
+            yield {"chunk_type": "intent", "intent": "FAQ"}
+            yield {"chunk_type": "content", "content": "Standard shipping takes 3-5 days"}
+            yield {"chunk_type": "complete"}
+
+        payload = {"q": "How long does standard shipping take", "sessionId": "stream-cache"}
+        with (
+            patch("app.api.v1.routes.run_shopping_graph_stream", fake_stream),
+            patch("app.api.v1.routes.session_service.touch_and_append", new=AsyncMock()),
+        ):
+            first = client.post("/api/v1/shopping/query/stream", json=payload)
+            second = client.post("/api/v1/shopping/query/stream", json=payload)
+
+        assert calls == 1
+        assert first.status_code == second.status_code == 200
+        assert second.content == first.content
+        assert second.content.endswith(b"data: [DONE]\n\n")
+
+    def test_low_confidence_stream_is_not_replayed(self, client):
+        """A stream whose final chunk reports low confidence is rerun for the next request."""
+        calls = 0
+
+        async def fake_stream(question):
+            nonlocal calls
+            calls += 1
+            yield {"chunk_type": "content", "content": "Possibly 30 days"}
+            yield {"chunk_type": "final", "confidence": "low"}
+            yield {"chunk_type": "complete"}
+
+        payload = {"q": "Can I return opened items", "sessionId": "stream-cache-low"}
+        with (
+            patch("app.api.v1.routes.run_shopping_graph_stream", fake_stream),
+            patch("app.api.v1.routes.session_service.touch_and_append", new=AsyncMock()),
+        ):
+            client.post("/api/v1/shopping/query/stream", json=payload)
+            client.post("/api/v1/shopping/query/stream", json=payload)
+
+        assert calls == 2
+
+    def test_low_confidence_answer_is_not_cached(self, client):
+        """Answers the graph marks as low confidence are not served from the answer cache."""
+        result = {"intent": "FAQ", "answer": "Not sure", "confidence": "low", "error": None}
+        payload = {"q": "Is the warranty transferable", "sessionId": "answer-cache-low"}
+
+        with (
+            patch("app.api.v1.routes.run_shopping_graph", AsyncMock(return_value=result)) as graph,
+            patch("app.api.v1.routes.session_service.touch_and_append", new=AsyncMock()),
+            patch("app.api.v1.routes.session_service.add_conversation_message", new=AsyncMock()),
+        ):
+            client.post("/api/v1/shopping/query", json=payload)
+            client.post("/api/v1/shopping/query", json=payload)
+
+        assert graph.await_count == 2
+
+
+class TestStreamCoalescing:
+    """Test merging of streamed content chunks into SSE frames."""
+
+    async def test_adjacent_content_chunks_are_merged(self):
+        """Adjacent content tokens collapse into one chunk; other chunk types pass through."""
+
+        async def upstream():
+            yield {"chunk_type": "metadata", "intent": "FAQ"}
+            yield {"chunk_type": "content", "content": "Free ", "is_final": False}
+            yield {"chunk_type": "content", "content": "shipping", "is_final": False}
+            yield {"chunk_type": "final", "confidence": "high"}
+
+        chunks = [chunk async for chunk in _coalesce_content_chunks(upstream())]
+
+        assert [c["chunk_type"] for c in chunks] == ["metadata", "content", "final"]
+        assert chunks[1]["content"] == "Free shipping"
+
+    async def test_slow_tokens_are_flushed_on_deadline(self):
+        """A buffered token is emitted once the batching delay expires."""
+
+        async def upstream():
+            yield {"chunk_type": "content", "content": "Hello", "is_final": False}
+            await asyncio.sleep(0.1)
+            yield {"chunk_type": "content", "content": " there", "is_final": True}
+
+        chunks = [chunk async for chunk in _coalesce_content_chunks(upstream())]
+
+        assert [c["content"] for c in chunks] == ["Hello", " there"]
+        assert chunks[-1]["is_final"] is True
+
+    async def test_prefetch_preserves_order_and_errors(self):
+        """Prefetched chunks arrive in order and an upstream failure surfaces after them."""
+
+        async def upstream():
+            for i in range(100):
+                yield {"chunk_type": "content", "content": str(i)}
+            raise RuntimeError("upstream failed")
+
+        received = []
+        with pytest.raises(RuntimeError, match="upstream failed"):
+            async for chunk in _prefetch_chunks(upstream()):
+                received.append(chunk["content"])
+
+        assert received == [str(i) for i in range(100)]
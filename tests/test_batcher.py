@@ -0,0 +1,63 @@
+"""Unit tests for the retriever search batcher."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.retrievers.batcher import SearchBatcher
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings keyed by question text that record each batch call."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.batches = []
+
+    async def aembed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [self.vectors[text] for text in texts]
+
+
+class TestSearchBatcher:
+    """Test cases for the retriever search batcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_share_one_embedding_call(self):
+        """Searches issued together are embedded in one batch and each gets its own results."""
+        embeddings = FakeEmbeddings({"shipping?": [1.0, 0.0], "returns?": [0.0, 1.0]})
+        batcher = SearchBatcher(embeddings)
+        mock_retriever = Mock()
+        mock_retriever.similarity_search.side_effect = lambda q, k, **kwargs: [q, kwargs["vector"]]
+
+        results = await asyncio.gather(
+            batcher.search(mock_retriever, "shipping?", k=8),
+            batcher.search(mock_retriever, "returns?", k=8),
+        )
+
+        assert embeddings.batches == [["shipping?", "returns?"]]
+        assert results[0] == (["shipping?", [1.0, 0.0]], [1.0, 0.0])
+        assert results[1] == (["returns?", [0.0, 1.0]], [0.0, 1.0])
+
+    @pytest.mark.asyncio
+    async def test_search_failure_only_affects_its_caller(self):
+        """One failing search raises for its caller while the rest of the batch succeeds."""
+        batcher = SearchBatcher(None)
+        mock_retriever = Mock()
+
+        def search(question, k, **kwargs):
+            if question == "bad":
+                raise RuntimeError("search failed")
+            return [question]
+
+        mock_retriever.similarity_search.side_effect = search
+
+        good, bad = await asyncio.gather(
+            batcher.search(mock_retriever, "good", k=3),
+            batcher.search(mock_retriever, "bad", k=3),
+            return_exceptions=True,
+        )
+
+        assert good == (["good"], None)
+        assert isinstance(bad, RuntimeError)
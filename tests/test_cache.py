@@ -0,0 +1,49 @@
+"""Unit tests for the in-process cache utilities."""
+
+import asyncio
+
+import pytest
+
+from app.utils.cache import AsyncTTLCache
+
+
+class TestInProcessCache:
+    """Tests for the in-process TTL cache used in front of the shopping graph."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_producer(self):
+        """Identical concurrent lookups run the producer once and later lookups hit the cache."""
+        cache = AsyncTTLCache(maxsize=8, ttl=60)
+        calls = 0
+
+        async def produce():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"answer": "Free shipping over $50"}
+
+        results = await asyncio.gather(*(cache.get_or_set("q", produce) for _ in range(5)))
+        assert calls == 1
+        assert all(r == {"answer": "Free shipping over $50"} for r in results)
+
+        await cache.get_or_set("q", produce)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_and_rejected_values_are_not_reused(self):
+        """Expired entries and values rejected by store_if trigger a fresh producer call."""
+        cache = AsyncTTLCache(maxsize=8, ttl=0)
+        calls = 0
+
+        async def produce():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        await cache.get_or_set("q", produce)
+        await cache.get_or_set("q", produce)
+        assert calls == 2
+
+        cache = AsyncTTLCache(maxsize=8, ttl=60)
+        await cache.get_or_set("q", produce, store_if=lambda value: False)
+        assert len(cache) == 0
@@ -0,0 +1,30 @@
+"""Unit tests for the cached embedding client."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.llm.embeddings import CachedOllamaEmbeddings
+
+
+class TestCachedEmbeddings:
+    """Test cases for the query embedding LRU cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_queries_skip_ollama(self):
+        """Normalized repeats are served from cache and only misses reach Ollama."""
+        embeddings = CachedOllamaEmbeddings(model="nomic-embed-text", cache_maxsize=2)
+        calls = []
+
+        async def fake_embed(texts):
+            calls.append(list(texts))
+            return [[float(len(text))] for text in texts]
+
+        with patch.object(CachedOllamaEmbeddings, "aembed_documents", side_effect=fake_embed):
+            first = await embeddings.aembed_query("Do you ship abroad?")
+            again = await embeddings.aembed_query("  do you ship ABROAD?")
+            batch = await embeddings.aembed_queries(["do you ship abroad?", "Returns?"])
+
+        assert first == again == batch[0] == [19.0]
+        assert batch[1] == [8.0]
+        assert calls == [["Do you ship abroad?"], ["Returns?"]]
@@ -156,6 +156,19 @@ class TestRAGService:
 
             assert "cannot provide a confident answer" in answer.lower()
 
+    def test_clients_are_created_on_first_use(self):
+        """Constructing the service connects nothing; the retriever is built once on access."""
+        with (
+            patch("app.services.rag_service.WeaviateRetriever") as mock_retriever_cls,
+            patch("app.services.rag_service.GroqClient") as mock_client_cls,
+        ):
+            service = RAGService()
+            mock_retriever_cls.assert_not_called()
+            mock_client_cls.assert_not_called()
+
+            assert service.retriever is service.retriever
+            mock_retriever_cls.assert_called_once()
+
 
 class TestRAGServiceFunctions:
     """Test the module-level functions."""
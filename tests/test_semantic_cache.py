@@ -0,0 +1,65 @@
+"""Unit tests for the shopping graph's semantic response cache."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.graphs.cache import SemanticCache
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings keyed by question text."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    async def aembed_query(self, text):
+        return self.vectors[text]
+
+
+class TestSemanticCache:
+    """Test cases for the semantic response cache."""
+
+    @pytest.mark.asyncio
+    async def test_exact_match_ignores_case_and_whitespace(self):
+        """Normalized duplicates hit without needing embeddings."""
+        cache = SemanticCache(None)
+        cache.store("Do you ship abroad?", {"answer": "Yes"}, None)
+
+        cached, _ = await cache.lookup("  do you   SHIP abroad? ")
+
+        assert cached == {"answer": "Yes"}
+
+    @pytest.mark.asyncio
+    async def test_similar_question_hits_above_threshold(self):
+        """A near-duplicate question reuses the stored answer; an unrelated one misses."""
+        cache = SemanticCache(
+            FakeEmbeddings(
+                {
+                    "What is your return policy?": [1.0, 0.0, 0.0],
+                    "What's the return policy?": [0.99, 0.1, 0.0],
+                    "Do you sell laptops?": [0.0, 1.0, 0.0],
+                }
+            ),
+            threshold=0.9,
+        )
+        _, vector = await cache.lookup("What is your return policy?")
+        cache.store("What is your return policy?", {"answer": "30 days"}, vector)
+
+        hit, _ = await cache.lookup("What's the return policy?")
+        miss, _ = await cache.lookup("Do you sell laptops?")
+
+        assert hit == {"answer": "30 days"}
+        assert miss is None
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self):
+        """Entries past their TTL are dropped instead of being returned."""
+        cache = SemanticCache(None, ttl=60)
+        cache.store("Do you ship abroad?", {"answer": "Yes"}, None)
+
+        with patch("app.graphs.cache.time.monotonic", return_value=10**9):
+            cached, _ = await cache.lookup("Do you ship abroad?")
+
+        assert cached is None
+        assert len(cache) == 0
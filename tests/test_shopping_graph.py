@@ -6,53 +6,107 @@ from unittest.mock import patch
 
 import pytest
 
+from app.graphs.cache import SemanticCache
+from app.graphs.shopping_graph import _classify_intent
+from app.graphs.shopping_graph import _embedding_relevance
+from app.graphs.shopping_graph import _filter_relevant_context
+from app.graphs.shopping_graph import _parse_classification
 from app.graphs.shopping_graph import _route_by_intent
+from app.graphs.shopping_graph import faq_answer_cache
+from app.graphs.shopping_graph import intent_cache
 from app.graphs.shopping_graph import node_answer_faq
 from app.graphs.shopping_graph import node_answer_other
 from app.graphs.shopping_graph import node_classify
+from app.graphs.shopping_graph import node_greeting
 from app.graphs.shopping_graph import node_retrieve
 from app.graphs.shopping_graph import run_shopping_graph
 from app.graphs.states import ShoppingState
+from app.retrievers.batcher import SearchBatcher
 
 
 class TestGraphNodes:
     """Test cases for individual graph nodes."""
 
-    def test_node_classify_success(self):
+    async def test_node_classify_success(self):
         """Test successful intent classification."""
         state: ShoppingState = {"question": "What are the product features?"}
 
         with (
-            patch("app.graphs.shopping_graph.intent_classification_prompt") as mock_prompt,
-            patch("app.graphs.shopping_graph.llm_client") as mock_llm,
+            patch("app.graphs.shopping_graph._classify_chain") as mock_get_chain,
+            patch("app.graphs.shopping_graph.get_llm_client") as mock_llm,
             patch("app.graphs.shopping_graph.parser") as mock_parser,
         ):
 
             # Mock the chain behavior
             mock_chain = Mock()
-            mock_chain.invoke.return_value = {"intent": "FAQ"}
-            mock_prompt.__or__ = Mock(return_value=mock_chain)
+            mock_chain.ainvoke = AsyncMock(return_value={"intent": "FAQ"})
+            mock_get_chain.return_value = mock_chain
 
-            result = node_classify(state)
+            result = await node_classify(state)
 
             assert result["intent"] == "FAQ"
             assert "error" not in result
 
-    def test_node_classify_error(self):
+    async def test_node_classify_error(self):
         """Test intent classification with error."""
         state: ShoppingState = {"question": "Test question"}
 
-        with patch("app.graphs.shopping_graph.intent_classification_prompt") as mock_prompt:
+        with patch("app.graphs.shopping_graph._classify_chain") as mock_get_chain:
             mock_chain = Mock()
-            mock_chain.invoke.side_effect = Exception("Classification error")
-            mock_prompt.__or__ = Mock(return_value=mock_chain)
+            mock_chain.ainvoke = AsyncMock(side_effect=Exception("Classification error"))
+            mock_get_chain.return_value = mock_chain
 
-            result = node_classify(state)
+            result = await node_classify(state)
 
             assert result["intent"] == "Other"
             assert "intent_error" in result["error"]
 
-    def test_node_retrieve_success(self):
+    async def test_node_classify_reuses_llm_intent_for_repeated_question(self):
+        """A repeated question reuses the LLM intent; failed classifications are retried."""
+        intent_cache.clear()
+
+        with patch("app.graphs.shopping_graph._classify_chain") as mock_get_chain:
+            mock_chain = Mock()
+            reply = Mock(content='{"result": "FAQ"}')
+            mock_chain.ainvoke = AsyncMock(side_effect=[Exception("Groq down"), reply])
+            mock_get_chain.return_value = mock_chain
+
+            failed = await _classify_intent("Any deals on headphones?")
+            first = await _classify_intent("Any deals on headphones?")
+            repeat = await _classify_intent("any DEALS on headphones? ")
+
+        assert failed == "Sales"  # keyword fallback
+        assert first == repeat == "FAQ"
+        assert mock_chain.ainvoke.await_count == 2
+
+    def test_parse_classification_handles_plain_and_fenced_json(self):
+        """Plain JSON replies and markdown-fenced ones both decode."""
+        plain = Mock(content='{"result": "FAQ"}')
+        fenced = Mock(content='```json\n{"result": "Sales"}\n```')
+
+        assert _parse_classification(plain) == {"result": "FAQ"}
+        assert _parse_classification(fenced) == {"result": "Sales"}
+
+    async def test_node_classify_prefetches_context_for_faq_only(self):
+        """Context retrieved alongside classification is kept for FAQs and dropped otherwise."""
+        retrieved = {"context": "Ships in 3 days", "retrieval_quality": "low", "context_count": 1}
+
+        with (
+            patch("app.graphs.shopping_graph.node_retrieve", AsyncMock(return_value=retrieved)),
+            patch("app.graphs.shopping_graph._classify_intent", AsyncMock(return_value="FAQ")),
+        ):
+            faq = await node_classify({"question": "How long does shipping take?"})
+
+        with (
+            patch("app.graphs.shopping_graph.node_retrieve", AsyncMock(return_value=retrieved)),
+            patch("app.graphs.shopping_graph._classify_intent", AsyncMock(return_value="Greeting")),
+        ):
+            greeting = await node_classify({"question": "Hello there"})
+
+        assert faq == {"intent": "FAQ", **retrieved}
+        assert greeting == {"intent": "Greeting"}
+
+    async def test_node_retrieve_success(self):
         """Test successful context retrieval."""
         state: ShoppingState = {"question": "What features are available?"}
 
@@ -61,37 +115,58 @@ class TestGraphNodes:
         mock_doc2 = Mock()
         mock_doc2.page_content = "Feature 2: Real-time analytics"
 
-        with patch("app.graphs.shopping_graph.retriever") as mock_retriever:
+        with patch("app.graphs.shopping_graph.get_retriever") as mock_get_retriever:
+            mock_retriever = mock_get_retriever.return_value
             mock_retriever.similarity_search.return_value = [mock_doc1, mock_doc2]
 
-            result = node_retrieve(state)
+            result = await node_retrieve(state)
 
             assert len(result["context"]) == 2
             assert "Advanced AI" in result["context"][0]
             assert "Real-time analytics" in result["context"][1]
 
-    def test_node_retrieve_no_retriever(self):
+    async def test_node_retrieve_no_retriever(self):
         """Test context retrieval when no retriever available."""
         state: ShoppingState = {"question": "Test question"}
 
-        with patch("app.graphs.shopping_graph.retriever", None):
-            result = node_retrieve(state)
+        with patch("app.graphs.shopping_graph.get_retriever", return_value=None):
+            result = await node_retrieve(state)
 
             assert result["context"] == []
 
-    def test_node_retrieve_error(self):
+    async def test_node_retrieve_error(self):
         """Test context retrieval with error."""
         state: ShoppingState = {"question": "Test question"}
 
-        with patch("app.graphs.shopping_graph.retriever") as mock_retriever:
+        with patch("app.graphs.shopping_graph.get_retriever") as mock_get_retriever:
+            mock_retriever = mock_get_retriever.return_value
             mock_retriever.similarity_search.side_effect = Exception("Retrieval error")
 
-            result = node_retrieve(state)
+            result = await node_retrieve(state)
 
             assert result["context"] == []
             assert "retrieval_error" in result["error"]
 
-    def test_node_answer_faq_success(self):
+    async def test_node_retrieve_reuses_context_for_repeated_question(self):
+        """A repeated question is answered from the retrieval cache without searching again."""
+        mock_doc = Mock(page_content="Standard shipping takes three to five business days")
+
+        with (
+            patch("app.graphs.shopping_graph.get_retriever") as mock_get_retriever,
+            patch("app.graphs.shopping_graph.retrieval_cache", SemanticCache(None)),
+            patch("app.graphs.shopping_graph.search_batcher", SearchBatcher(None)),
+        ):
+            mock_retriever = mock_get_retriever.return_value
+            mock_retriever.similarity_search.return_value = [mock_doc]
+
+            first = await node_retrieve({"question": "How long does standard shipping take?"})
+            second = await node_retrieve({"question": "how long does standard shipping take?"})
+
+        assert second == first
+        assert first["context_count"] == 1
+        mock_retriever.similarity_search.assert_called_once()
+
+    async def test_node_answer_faq_success(self):
         """Test successful FAQ answer generation."""
         state: ShoppingState = {
             "question": "What are the features?",
@@ -99,54 +174,83 @@ class TestGraphNodes:
         }
 
         with (
-            patch("app.graphs.shopping_graph.rag_prompt") as mock_prompt,
-            patch("app.graphs.shopping_graph.llm_client") as mock_llm,
+            patch("app.graphs.shopping_graph._rag_chain") as mock_get_chain,
+            patch("app.graphs.shopping_graph.get_llm_client") as mock_llm,
         ):
 
             mock_chain = Mock()
-            mock_response = Mock()
-            mock_response.content = "The product features include AI-powered capabilities."
-            mock_chain.invoke.return_value = mock_response
-            mock_prompt.__or__ = Mock(return_value=mock_chain)
+            mock_chain.ainvoke = AsyncMock(
+                return_value="The product features include AI-powered capabilities."
+            )
+            mock_get_chain.return_value = mock_chain
 
-            result = node_answer_faq(state)
+            result = await node_answer_faq(state)
 
             assert result["answer"] == "The product features include AI-powered capabilities."
             assert "error" not in result
 
-    def test_node_answer_faq_no_context(self):
+    async def test_node_answer_faq_reuses_answer_for_same_context(self):
+        """A repeated question over the same context is answered without another LLM call."""
+        faq_answer_cache.clear()
+        state: ShoppingState = {"question": "Do you ship abroad?", "context": ["Ships worldwide"]}
+
+        with patch("app.graphs.shopping_graph._rag_chain") as mock_get_chain:
+            mock_chain = Mock()
+            mock_chain.ainvoke = AsyncMock(return_value="Yes, we ship to 40 countries worldwide.")
+            mock_get_chain.return_value = mock_chain
+
+            first = await node_answer_faq(state)
+            repeat = await node_answer_faq({**state, "question": "  do you SHIP abroad? "})
+            await node_answer_faq({**state, "context": ["Ships within the EU only"]})
+
+        assert repeat["answer"] == first["answer"]
+        assert mock_chain.ainvoke.await_count == 2
+
+    async def test_node_answer_faq_no_context(self):
         """Test FAQ answer generation with no context."""
         state: ShoppingState = {"question": "What are the features?", "context": []}
 
         with (
-            patch("app.graphs.shopping_graph.rag_prompt") as mock_prompt,
-            patch("app.graphs.shopping_graph.llm_client") as mock_llm,
+            patch("app.graphs.shopping_graph._rag_chain") as mock_get_chain,
+            patch("app.graphs.shopping_graph.get_llm_client") as mock_llm,
         ):
 
             mock_chain = Mock()
-            mock_response = Mock()
-            mock_response.content = "Based on available information..."
-            mock_chain.invoke.return_value = mock_response
-            mock_prompt.__or__ = Mock(return_value=mock_chain)
+            mock_chain.ainvoke = AsyncMock(return_value="Based on available information...")
+            mock_get_chain.return_value = mock_chain
 
-            result = node_answer_faq(state)
+            result = await node_answer_faq(state)
 
             assert "available information" in result["answer"]
 
-    def test_node_answer_faq_error(self):
+    async def test_node_answer_faq_error(self):
         """Test FAQ answer generation with error."""
         state: ShoppingState = {"question": "Test question", "context": ["Some context"]}
 
-        with patch("app.graphs.shopping_graph.rag_prompt") as mock_prompt:
+        with patch("app.graphs.shopping_graph._rag_chain") as mock_get_chain:
             mock_chain = Mock()
-            mock_chain.invoke.side_effect = Exception("LLM error")
-            mock_prompt.__or__ = Mock(return_value=mock_chain)
+            mock_chain.ainvoke = AsyncMock(side_effect=Exception("LLM error"))
+            mock_get_chain.return_value = mock_chain
 
-            result = node_answer_faq(state)
+            result = await node_answer_faq(state)
 
             assert "trouble answering" in result["answer"]
             assert "answer_error" in result["error"]
 
+    async def test_node_greeting_templates_bare_greetings(self):
+        """A bare greeting is answered from a template; anything longer goes to the LLM."""
+        with patch("app.graphs.shopping_graph._greeting_chain") as mock_get_chain:
+            mock_get_chain.return_value.ainvoke = AsyncMock(return_value="LLM greeting")
+
+            bare = await node_greeting({"question": "Hello!"})
+            again = await node_greeting({"question": "  hello "})
+            longer = await node_greeting({"question": "Hi, I need a new laptop bag"})
+
+        assert bare["confidence"] == "high"
+        assert bare["answer"] == again["answer"] != "LLM greeting"
+        assert longer["answer"] == "LLM greeting"
+        mock_get_chain.return_value.ainvoke.assert_awaited_once()
+
     def test_node_answer_other(self):
         """Test other intent answer generation."""
         state: ShoppingState = {"question": "How's the weather?"}
@@ -156,6 +260,35 @@ class TestGraphNodes:
         assert "FAQ" in result["answer"]
         assert "only answer" in result["answer"]
 
+    def test_filter_relevant_context_ranks_by_embedding_scores(self):
+        """Contexts are ordered by embedding similarity and weak matches are dropped."""
+        contexts = [
+            "Gift cards can be redeemed at checkout online",
+            "Orders ship within two business days of purchase",
+            "Deliveries usually arrive within a week of dispatch",
+        ]
+        scores = _embedding_relevance([1.0, 0.0], [[0.1, 1.0], [0.8, 0.6], [1.0, 0.1]])
+
+        result = _filter_relevant_context("How long does shipping take?", contexts, 0.3, scores)
+
+        assert result == [contexts[2], contexts[1]]
+
+    def test_filter_relevant_context_ignores_stopwords(self):
+        """Overlap on common words alone doesn't make a context relevant."""
+        contexts = [
+            "What is the best way to pay for the order online",
+            "The return window is 30 days for all shoes bought in store",
+        ]
+
+        result = _filter_relevant_context("What is the return window for shoes", contexts)
+
+        assert result == [contexts[1]]
+
+    def test_embedding_relevance_requires_every_vector(self):
+        """Missing document vectors disable embedding scoring."""
+        assert _embedding_relevance([1.0, 0.0], [[1.0, 0.0], None]) is None
+        assert _embedding_relevance(None, [[1.0, 0.0]]) is None
+
 
 class TestGraphRouting:
     """Test cases for graph routing logic."""
@@ -166,7 +299,7 @@ class TestGraphRouting:
 
         route = _route_by_intent(state)
 
-        assert route == "retrieve_context"
+        assert route == "answer_faq"
 
     def test_route_by_intent_other(self):
         """Test routing for Other intent."""
@@ -198,7 +331,7 @@ class TestGraphRouting:
 
         route = _route_by_intent(state)
 
-        assert route == "retrieve_context"
+        assert route == "answer_faq"
 
 
 class TestShoppingGraph:
@@ -295,37 +428,32 @@ class TestGraphIntegration:
     @pytest.mark.asyncio
     async def test_faq_flow_integration(self):
         """Test the complete FAQ flow integration."""
-        # Test the flow: classify -> retrieve -> answer
+        # Test the flow: classify (retrieving context alongside) -> answer
         question = "What features does the product have?"
 
         # Mock each step
         with (
             patch("app.graphs.shopping_graph.node_classify") as mock_classify,
-            patch("app.graphs.shopping_graph.node_retrieve") as mock_retrieve,
             patch("app.graphs.shopping_graph.node_answer_faq") as mock_answer,
         ):
 
-            mock_classify.return_value = {"intent": "FAQ"}
-            mock_retrieve.return_value = {"context": ["Feature docs"]}
+            mock_classify.return_value = {"intent": "FAQ", "context": ["Feature docs"]}
             mock_answer.return_value = {"answer": "Product has advanced AI features"}
 
             # Simulate the flow
             state: ShoppingState = {"question": question}
 
             # Step 1: Classify
-            state.update(mock_classify(state))
+            state.update(await mock_classify(state))
             assert state["intent"] == "FAQ"
+            assert state["context"] == ["Feature docs"]
 
             # Step 2: Route decision
             route = _route_by_intent(state)
-            assert route == "retrieve_context"
-
-            # Step 3: Retrieve
-            state.update(mock_retrieve(state))
-            assert state["context"] == ["Feature docs"]
+            assert route == "answer_faq"
 
-            # Step 4: Answer
-            state.update(mock_answer(state))
+            # Step 3: Answer
+            state.update(await mock_answer(state))
             assert "AI features" in state["answer"]
 
     @pytest.mark.asyncio
@@ -345,7 +473,7 @@ class TestGraphIntegration:
             state: ShoppingState = {"question": question}
 
             # Step 1: Classify
-            state.update(mock_classify(state))
+            state.update(await mock_classify(state))
             assert state["intent"] == "Other"
 
             # Step 2: Route decision
@@ -355,3 +483,19 @@ class TestGraphIntegration:
             # Step 3: Answer directly
             state.update(mock_answer(state))
             assert "FAQ questions" in state["answer"]
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_answers_are_not_cached(self):
+        """run_shopping_graph reruns the graph when the previous answer had low confidence."""
+        final_state = {"intent": "FAQ", "answer": "Not sure", "confidence": "low", "error": None}
+
+        with (
+            patch("app.graphs.shopping_graph.compiled") as mock_compiled,
+            patch("app.graphs.shopping_graph.response_cache", SemanticCache(None)),
+        ):
+            mock_compiled.ainvoke = AsyncMock(return_value=final_state)
+
+            await run_shopping_graph("Is the warranty transferable?")
+            await run_shopping_graph("Is the warranty transferable?")
+
+            assert mock_compiled.ainvoke.call_count == 2